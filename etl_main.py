@@ -15,24 +15,104 @@ Extract-Transform-Load: 提取、转换、加载
     python etl_main.py --reprocess        # 重新处理所有文件（包括已处理的）
     python etl_main.py --archive          # 处理后移动文件到归档目录
     python etl_main.py --stats            # 显示数据库统计信息
+    python etl_main.py --workers 4        # 使用 4 个进程并行解析文件
+    python etl_main.py --pdf-workers 4    # 使用 4 个进程并行解析单个 PDF 的各页
 
 作者：自动化脚本
 创建日期：2024-01-13
 """
 
+import os
+import re
 import sys
+import hashlib
+import tarfile
 import argparse
 import shutil
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
 from pathlib import Path
-from typing import List
+from typing import List, Tuple, Optional, Dict, Any, Set
 
 # 将 src 目录添加到 Python 路径
 sys.path.insert(0, str(Path(__file__).parent / "src"))
 
 from src.logger import setup_logger
 from src.database import DatabaseManager
-from src.parsers import InventoryParser, DeliveryNoticeParser
-from src.config import DATA_ROOT
+from src.parsers import InventoryParser, DeliveryNoticeParser, detect_report_type
+from src.config import DATA_ROOT, ARCHIVE_MODE, ARCHIVE_ZSTD_LEVEL
+
+try:
+    import zstandard  # 可选依赖：批量归档压缩
+except ImportError:
+    zstandard = None
+
+
+# 支持的文件格式（小写扩展名）
+SUPPORTED_EXTENSIONS = frozenset({'.csv', '.xls', '.xlsx', '.pdf'})
+
+# 文件名分类关键词（预编译，忽略大小写）
+_INVENTORY_NAME_RE = re.compile(r'stock', re.IGNORECASE)
+_DELIVERY_NAME_RE = re.compile(r'delivery|notice', re.IGNORECASE)
+
+# 计算文件哈希时每次读取的块大小
+_HASH_CHUNK_SIZE = 1024 * 1024  # 1MB
+
+
+def file_sha1(file_path: Path) -> str:
+    """
+    计算文件内容的 SHA-1
+
+    Args:
+        file_path: 文件路径
+
+    Returns:
+        SHA-1 十六进制字符串
+    """
+    with open(file_path, 'rb') as f:
+        if hasattr(hashlib, 'file_digest'):  # Python 3.11+
+            return hashlib.file_digest(f, 'sha1').hexdigest()
+
+        digest = hashlib.sha1()
+        for chunk in iter(lambda: f.read(_HASH_CHUNK_SIZE), b''):
+            digest.update(chunk)
+        return digest.hexdigest()
+
+
+# 子进程内的解析器实例（每个工作进程只创建一次）
+_worker_parsers = None
+
+
+def _parse_in_worker(file_path_str: str) -> Tuple[str, Optional[List[Dict[str, Any]]], Optional[str]]:
+    """
+    进程池工作函数：在子进程中解析单个文件
+
+    只负责解析（CPU 密集），不访问数据库；入库、日志记录和归档
+    统一由主进程完成，保证 SQLite 只被一个进程写入。
+
+    Args:
+        file_path_str: 文件路径字符串
+
+    Returns:
+        (文件类型, 记录列表, 错误信息)
+    """
+    global _worker_parsers
+
+    if _worker_parsers is None:
+        logger = setup_logger("CME_ETL")
+        _worker_parsers = (InventoryParser(logger), DeliveryNoticeParser(logger))
+
+    inventory_parser, delivery_parser = _worker_parsers
+    file_path = Path(file_path_str)
+    file_type = CMEDataETL.classify_file(file_path)
+
+    try:
+        records = CMEDataETL.parse_records(file_path, file_type,
+                                           inventory_parser, delivery_parser)
+        return file_type, records, None
+    except Exception as e:
+        inventory_parser.logger.error(f"处理文件失败: {e}", exc_info=True)
+        return file_type, None, str(e)
 
 
 class CMEDataETL:
@@ -47,7 +127,7 @@ class CMEDataETL:
     """
 
     def __init__(self, data_dir: Path, db_path: Path, archive_dir: Path = None,
-                 logger=None):
+                 logger=None, pdf_workers: int = 1):
         """
         初始化 ETL 处理器
 
@@ -56,6 +136,7 @@ class CMEDataETL:
             db_path: 数据库文件路径
             archive_dir: 归档目录（可选）
             logger: 日志记录器
+            pdf_workers: 串行处理文件时，并行解析单个 PDF 各页的进程数（0 表示按 CPU 核数自动选择）
         """
         self.data_dir = Path(data_dir)
         self.db_path = Path(db_path)
@@ -67,13 +148,28 @@ class CMEDataETL:
 
         # 初始化解析器
         self.inventory_parser = InventoryParser(self.logger)
-        self.delivery_parser = DeliveryNoticeParser(self.logger)
+        self.delivery_parser = DeliveryNoticeParser(self.logger, page_workers=pdf_workers)
+
+        # 文件内容 SHA-1 缓存（文件路径 -> SHA-1；每次扫描重新计算）
+        self._content_hashes: Dict[Path, str] = {}
+
+        # 本次运行中已成功入库的文件内容 SHA-1（识别同一批次内的重复文件）
+        self._stored_hashes: Set[str] = set()
+
+        # 最近一次扫描时识别出的重复文件（内容与以往已入库文件相同，不再处理，归档时一并归档）
+        self._scan_duplicates: List[Path] = []
+
+        # 归档重名文件的下一个可用序号（目标路径 -> 序号）
+        self._archive_counters: Dict[Path, int] = {}
+
+        # 本次运行的归档子目录（首次归档时创建，每次 process_all 重置）
+        self._archive_subdir: Optional[Path] = None
 
         # 创建归档目录
         if self.archive_dir:
             self.archive_dir.mkdir(parents=True, exist_ok=True)
 
-    def scan_files(self, reprocess: bool = False) -> List[Path]:
+    def scan_files(self, reprocess: bool = False) -> List[Tuple[Path, os.stat_result]]:
         """
         扫描数据目录，找到需要处理的文件
 
@@ -81,34 +177,136 @@ class CMEDataETL:
             reprocess: 是否重新处理已处理过的文件
 
         Returns:
-            文件路径列表
+            (文件路径, 文件状态) 列表；文件状态来自 os.scandir 的缓存结果，
+            后续处理无需再次 stat。按修改时间（即下载顺序）排列，内容相同的文件
+            保留最早下载的一个。内容与以往已入库文件相同的文件不在其中，
+            记录在 _scan_duplicates
         """
         self.logger.info(f"扫描数据目录: {self.data_dir}")
+        self._scan_duplicates = []
 
         if not self.data_dir.exists():
             self.logger.error(f"数据目录不存在: {self.data_dir}")
             return []
 
-        # 支持的文件格式
-        patterns = ['*.csv', '*.xls', '*.xlsx', '*.pdf']
-        all_files = []
+        # 单次遍历目录，按扩展名过滤支持的文件格式
+        with os.scandir(self.data_dir) as entries:
+            all_files = [
+                (Path(entry.path), entry.stat()) for entry in entries
+                if os.path.splitext(entry.name)[1].lower() in SUPPORTED_EXTENSIONS
+                and entry.is_file()
+            ]
 
-        for pattern in patterns:
-            files = list(self.data_dir.glob(pattern))
-            all_files.extend(files)
+        # 文件内容可能已变化，哈希每次扫描重新计算
+        self._content_hashes.clear()
 
         # 过滤已处理的文件
         if not reprocess:
-            unprocessed_files = []
-            for file_path in all_files:
-                if not self.db_manager.is_file_processed(str(file_path)):
-                    unprocessed_files.append(file_path)
-            all_files = unprocessed_files
+            processed_paths = self.db_manager.get_processed_file_paths()
+            all_files = [(f, st) for f, st in all_files if str(f) not in processed_paths]
+            all_files = self._skip_duplicate_content(all_files)
 
         self.logger.info(f"找到 {len(all_files)} 个文件待处理")
-        return sorted(all_files)
+        # 按下载顺序处理（修改时间相同时按路径），同批次内容相同的文件中
+        # 最早下载的文件入库，后来重新发布的副本（如 *_copy）记录为 duplicate
+        return sorted(all_files, key=lambda item: (item[1].st_mtime, item[0]))
+
+    def _get_content_hash(self, file_path: Path) -> str:
+        """
+        获取文件内容 SHA-1（同一次运行内缓存）
+
+        Args:
+            file_path: 文件路径
+
+        Returns:
+            SHA-1 十六进制字符串
+        """
+        content_sha1 = self._content_hashes.get(file_path)
+        if content_sha1 is None:
+            content_sha1 = file_sha1(file_path)
+            self._content_hashes[file_path] = content_sha1
+        return content_sha1
+
+    def _skip_duplicate_content(self, files: List[Tuple[Path, os.stat_result]]
+                                ) -> List[Tuple[Path, os.stat_result]]:
+        """
+        过滤内容与已入库文件完全相同的文件
+
+        CME 有时以新文件名（含新日期）重新发布相同内容的报告，
+        按内容哈希识别后直接跳过解析和入库，记录为 duplicate，
+        并加入 _scan_duplicates 供归档。每个文件只计算一次哈希，入库记录日志时复用。
+
+        Args:
+            files: 待处理的 (文件路径, 文件状态) 列表
+
+        Returns:
+            需要处理的 (文件路径, 文件状态) 列表
+        """
+        if not files:
+            return files
+
+        processed_hashes = self.db_manager.get_processed_content_hashes()
+
+        unique_files = []
+        for file_path, st in files:
+            try:
+                content_sha1 = self._get_content_hash(file_path)
+            except OSError as e:
+                self.logger.warning(f"计算文件哈希失败，将正常处理: {file_path.name} ({e})")
+                unique_files.append((file_path, st))
+                continue
+
+            if content_sha1 in processed_hashes:
+                self._log_duplicate(file_path, st, content_sha1)
+                self._scan_duplicates.append(file_path)
+            else:
+                unique_files.append((file_path, st))
+
+        return unique_files
+
+    def _skip_stored_in_batch(self, file_path: Path, st: Optional[os.stat_result]) -> bool:
+        """
+        检查文件内容是否与本次运行中已成功入库的文件相同，相同时记录为 duplicate
+
+        同一批次内的重复文件在扫描时无法排除（先处理的文件可能失败），
+        因此在入库前按处理顺序判断。
+
+        Args:
+            file_path: 文件路径
+            st: 文件状态（可选）
+
+        Returns:
+            是重复文件（已记录日志，应跳过）返回 True
+        """
+        content_sha1 = self._content_hashes.get(file_path)
+        if content_sha1 is None or content_sha1 not in self._stored_hashes:
+            return False
+
+        self._log_duplicate(file_path, st or file_path.stat(), content_sha1)
+        return True
+
+    def _log_duplicate(self, file_path: Path, st: os.stat_result, content_sha1: str):
+        """
+        记录内容重复的文件
 
-    def classify_file(self, file_path: Path) -> str:
+        Args:
+            file_path: 文件路径
+            st: 文件状态
+            content_sha1: 文件内容 SHA-1
+        """
+        self.logger.info(f"文件内容与已处理文件相同，跳过: {file_path.name}")
+        self.db_manager.log_file_processing(
+            str(file_path),
+            file_path.name,
+            self.classify_file(file_path),
+            st.st_size,
+            'duplicate',
+            error_message="文件内容与已处理文件相同",
+            content_sha1=content_sha1
+        )
+
+    @staticmethod
+    def classify_file(file_path: Path) -> str:
         """
         根据文件名判断文件类型
 
@@ -118,25 +316,27 @@ class CMEDataETL:
         Returns:
             文件类型：'inventory' 或 'delivery'
         """
-        filename_lower = file_path.name.lower()
+        filename = file_path.name
 
         # 库存报告
-        if 'stock' in filename_lower or 'stocks' in filename_lower:
+        if _INVENTORY_NAME_RE.search(filename):
             return 'inventory'
 
         # 交割通知
-        if 'delivery' in filename_lower or 'notice' in filename_lower:
+        if _DELIVERY_NAME_RE.search(filename):
             return 'delivery'
 
         # 默认：尝试根据文件扩展名判断
-        if file_path.suffix.lower() in ['.csv', '.xls', '.xlsx']:
+        suffix = file_path.suffix.lower()
+        if suffix in ('.csv', '.xls', '.xlsx'):
             return 'inventory'
-        elif file_path.suffix.lower() == '.pdf':
+        elif suffix == '.pdf':
             return 'delivery'
 
         return 'unknown'
 
-    def detect_report_type(self, filename: str) -> str:
+    @staticmethod
+    def detect_report_type(filename: str) -> str:
         """
         检测交割通知的报告类型
 
@@ -146,23 +346,43 @@ class CMEDataETL:
         Returns:
             报告类型：'Daily', 'Monthly', 或 'YTD'
         """
-        filename_lower = filename.lower()
+        return detect_report_type(filename)
 
-        if 'daily' in filename_lower:
-            return 'Daily'
-        elif 'monthly' in filename_lower:
-            return 'Monthly'
-        elif 'ytd' in filename_lower or 'year' in filename_lower:
-            return 'YTD'
+    @staticmethod
+    def parse_records(file_path: Path, file_type: str,
+                      inventory_parser: InventoryParser,
+                      delivery_parser: DeliveryNoticeParser) -> Optional[List[Dict[str, Any]]]:
+        """
+        调用相应的解析器解析文件（不访问数据库）
 
-        return 'Daily'  # 默认
+        Args:
+            file_path: 文件路径
+            file_type: 文件类型（'inventory' 或 'delivery'）
+            inventory_parser: 库存报告解析器
+            delivery_parser: 交割通知解析器
 
-    def process_file(self, file_path: Path) -> bool:
+        Returns:
+            解析后的记录列表；未知文件类型返回 None
+        """
+        if file_type == 'inventory':
+            inventory_parser.logger.info("文件类型: 库存报告")
+            return inventory_parser.parse_file(file_path)
+
+        if file_type == 'delivery':
+            delivery_parser.logger.info("文件类型: 交割通知")
+            report_type = CMEDataETL.detect_report_type(file_path.name)
+            delivery_parser.logger.info(f"报告类型: {report_type}")
+            return delivery_parser.parse_file(file_path, report_type)
+
+        return None
+
+    def process_file(self, file_path: Path, st: os.stat_result = None) -> bool:
         """
         处理单个文件
 
         Args:
             file_path: 文件路径
+            st: 文件状态（可选，通常来自 scan_files；未提供时重新 stat）
 
         Returns:
             成功返回 True，失败返回 False
@@ -172,28 +392,64 @@ class CMEDataETL:
         self.logger.info("="*60)
 
         file_type = self.classify_file(file_path)
-        file_size = file_path.stat().st_size
 
         try:
-            records = []
+            records = self.parse_records(file_path, file_type,
+                                         self.inventory_parser, self.delivery_parser)
+        except Exception as e:
+            self.logger.error(f"处理文件失败: {e}", exc_info=True)
+            return self.store_records(file_path, file_type, None,
+                                      error_message=str(e), st=st)
 
-            # 调用相应的解析器
-            if file_type == 'inventory':
-                self.logger.info("文件类型: 库存报告")
-                records = self.inventory_parser.parse_file(file_path)
+        return self.store_records(file_path, file_type, records, st=st)
 
+    def store_records(self, file_path: Path, file_type: str,
+                      records: Optional[List[Dict[str, Any]]],
+                      error_message: str = None,
+                      st: os.stat_result = None) -> bool:
+        """
+        将解析结果入库并记录处理日志（仅在主进程调用）
+
+        Args:
+            file_path: 文件路径
+            file_type: 文件类型
+            records: 解析后的记录列表（未知文件类型为 None）
+            error_message: 解析阶段的错误信息（如果有）
+            st: 文件状态（可选，未提供时重新 stat）
+
+        Returns:
+            成功返回 True，失败返回 False
+        """
+        file_size = (st or file_path.stat()).st_size
+
+        try:
+            if error_message is not None:
+                self.db_manager.log_file_processing(
+                    str(file_path),
+                    file_path.name,
+                    file_type,
+                    file_size,
+                    'failed',
+                    error_message=error_message
+                )
+                return False
+
+            # 入库前计算内容哈希（通常已在扫描时计算）：入库后再计算时若读取失败，
+            # 数据已写入却会被记录为 failed。计算失败时照常入库，只是不记录哈希
+            content_sha1 = None
+            if records:
+                try:
+                    content_sha1 = self._get_content_hash(file_path)
+                except OSError as e:
+                    self.logger.warning(f"计算文件哈希失败，不记录内容哈希: {file_path.name} ({e})")
+
+            if file_type == 'inventory':
                 if records:
                     # 插入数据库
                     count = self.db_manager.insert_inventory_records(records)
                     self.logger.info(f"成功插入 {count} 条库存记录")
 
             elif file_type == 'delivery':
-                self.logger.info("文件类型: 交割通知")
-                report_type = self.detect_report_type(file_path.name)
-                self.logger.info(f"报告类型: {report_type}")
-
-                records = self.delivery_parser.parse_file(file_path, report_type)
-
                 if records:
                     # 插入数据库
                     count = self.db_manager.insert_delivery_records(records)
@@ -219,8 +475,11 @@ class CMEDataETL:
                     file_type,
                     file_size,
                     'success',
-                    records_inserted=len(records)
+                    records_inserted=len(records),
+                    content_sha1=content_sha1
                 )
+                if content_sha1 is not None:
+                    self._stored_hashes.add(content_sha1)
                 return True
             else:
                 self.db_manager.log_file_processing(
@@ -256,74 +515,214 @@ class CMEDataETL:
             return
 
         try:
-            # 创建归档子目录（按年月分类）
-            from datetime import datetime
-            year_month = datetime.now().strftime("%Y-%m")
-            archive_subdir = self.archive_dir / year_month
-            archive_subdir.mkdir(parents=True, exist_ok=True)
+            archive_subdir = self._get_archive_subdir()
 
             # 移动文件
             dest_path = archive_subdir / file_path.name
 
-            # 如果目标文件已存在，添加序号
+            # 如果目标文件已存在，添加序号（从上次使用的序号继续，避免重复探测）
             if dest_path.exists():
+                base_path = dest_path
                 base_name = dest_path.stem
                 suffix = dest_path.suffix
-                counter = 1
+                counter = self._archive_counters.get(base_path, 1)
                 while dest_path.exists():
                     dest_path = archive_subdir / f"{base_name}_{counter}{suffix}"
                     counter += 1
+                self._archive_counters[base_path] = counter
 
-            shutil.move(str(file_path), str(dest_path))
+            # 同一文件系统内 rename 只修改元数据；跨设备时回退到复制+删除
+            try:
+                os.rename(file_path, dest_path)
+            except OSError:
+                shutil.move(str(file_path), str(dest_path))
             self.logger.info(f"文件已归档: {dest_path}")
 
         except Exception as e:
             self.logger.error(f"归档文件失败: {e}")
 
-    def process_all(self, reprocess: bool = False, archive: bool = False):
+    def archive_files_as_tar(self, file_paths: List[Path]):
+        """
+        将已处理的文件打包归档（一个压缩包代替大量小文件）
+
+        优先使用 zstd 压缩（需要 zstandard），否则使用 gzip。
+        打包成功后才删除原文件；失败时保留原文件。
+
+        Args:
+            file_paths: 待归档的文件路径列表
+        """
+        if not self.archive_dir or not file_paths:
+            return
+
+        archive_path = None
+        try:
+            archive_subdir = self._get_archive_subdir()
+            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+            base_name = f"archive_{archive_subdir.name}_{timestamp}"
+
+            if zstandard is not None:
+                archive_path = archive_subdir / f"{base_name}.tar.zst"
+                compressor = zstandard.ZstdCompressor(level=ARCHIVE_ZSTD_LEVEL)
+                with open(archive_path, 'wb') as raw:
+                    with compressor.stream_writer(raw, closefd=False) as writer:
+                        with tarfile.open(fileobj=writer, mode='w|') as tar:
+                            for file_path in file_paths:
+                                tar.add(str(file_path), arcname=file_path.name)
+            else:
+                archive_path = archive_subdir / f"{base_name}.tar.gz"
+                with tarfile.open(archive_path, mode='w:gz') as tar:
+                    for file_path in file_paths:
+                        tar.add(str(file_path), arcname=file_path.name)
+
+        except Exception as e:
+            self.logger.error(f"打包归档失败: {e}")
+            if archive_path is not None and archive_path.exists():
+                archive_path.unlink()
+            return
+
+        for file_path in file_paths:
+            try:
+                file_path.unlink()
+            except OSError as e:
+                self.logger.error(f"删除已归档文件失败: {file_path.name} ({e})")
+
+        self.logger.info(f"已打包归档 {len(file_paths)} 个文件: {archive_path}")
+
+    def _get_archive_subdir(self) -> Path:
+        """
+        获取本次运行的归档子目录（按年月分类）
+
+        年月在一次运行中不变，只计算并创建一次目录
+
+        Returns:
+            归档子目录路径
+        """
+        if self._archive_subdir is None:
+            year_month = datetime.now().strftime("%Y-%m")
+            self._archive_subdir = self.archive_dir / year_month
+            self._archive_subdir.mkdir(parents=True, exist_ok=True)
+        return self._archive_subdir
+
+    def process_all(self, reprocess: bool = False, archive: bool = False,
+                    workers: int = 1):
         """
         处理所有文件
 
         Args:
             reprocess: 是否重新处理已处理过的文件
             archive: 是否归档已处理的文件
+            workers: 并行解析的进程数（1 表示串行处理）
         """
         self.logger.info("开始 ETL 处理任务")
 
+        # 每次运行重新确定归档子目录
+        self._archive_subdir = None
+        self._stored_hashes.clear()
+
         # 扫描文件
         files = self.scan_files(reprocess=reprocess)
 
+        # 扫描时识别出的重复文件不再处理，但与批次内的重复文件一样需要归档，
+        # 否则会一直留在数据目录中（打包模式下与本次处理的文件打进同一个包）
+        pending_archive = []
+        if archive and self._scan_duplicates:
+            if ARCHIVE_MODE == "tar":
+                pending_archive.extend(self._scan_duplicates)
+            else:
+                for file_path in self._scan_duplicates:
+                    self.archive_file(file_path)
+
         if not files:
             self.logger.info("没有文件需要处理")
+            if pending_archive:
+                self.archive_files_as_tar(pending_archive)
+            self.db_manager.flush_logs()
             return
 
-        # 处理每个文件
+        # 处理每个文件（重复文件单独计数，与 get_processing_stats 的口径一致）
         success_count = 0
         failed_count = 0
+        duplicate_count = len(self._scan_duplicates)
 
-        for file_path in files:
-            success = self.process_file(file_path)
+        for file_path, status in self._iter_process_results(files, workers):
+            if status == 'failed':
+                failed_count += 1
+                continue
 
-            if success:
+            if status == 'success':
                 success_count += 1
+            else:
+                duplicate_count += 1
 
-                # 归档文件
-                if archive:
+            # 归档文件（打包模式下处理完成后统一归档）
+            if archive:
+                if ARCHIVE_MODE == "tar":
+                    pending_archive.append(file_path)
+                else:
                     self.archive_file(file_path)
-            else:
-                failed_count += 1
+
+        if pending_archive:
+            self.archive_files_as_tar(pending_archive)
+
+        # 写入缓冲的文件处理日志
+        self.db_manager.flush_logs()
+
+        # 批量导入后更新统计信息
+        if success_count:
+            self.db_manager.analyze()
 
         # 显示统计
         self.logger.info("="*60)
         self.logger.info("ETL 处理完成")
-        self.logger.info(f"总文件数: {len(files)}")
+        self.logger.info(f"总文件数: {len(files) + len(self._scan_duplicates)}")
         self.logger.info(f"成功: {success_count}")
         self.logger.info(f"失败: {failed_count}")
+        self.logger.info(f"重复: {duplicate_count}")
         self.logger.info("="*60)
 
         # 显示数据库统计
         self.show_stats()
 
+    def _iter_process_results(self, files: List[Tuple[Path, os.stat_result]], workers: int):
+        """
+        依次产出每个文件的处理结果
+
+        workers > 1 时解析任务分发到进程池，入库仍在主进程按文件顺序完成。
+        内容与本次已入库文件相同的文件不再入库，结果为 'duplicate'。
+
+        Args:
+            files: (文件路径, 文件状态) 列表
+            workers: 并行解析的进程数
+
+        Yields:
+            (文件路径, 处理结果)；处理结果为 'success'、'failed' 或 'duplicate'
+        """
+        if workers <= 1 or len(files) <= 1:
+            for file_path, st in files:
+                if self._skip_stored_in_batch(file_path, st):
+                    yield file_path, 'duplicate'
+                    continue
+                success = self.process_file(file_path, st)
+                yield file_path, 'success' if success else 'failed'
+            return
+
+        self.logger.info(f"使用 {workers} 个进程并行解析 {len(files)} 个文件")
+        chunksize = max(1, len(files) // (workers * 4))
+
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            results = executor.map(_parse_in_worker,
+                                   [str(file_path) for file_path, _ in files],
+                                   chunksize=chunksize)
+
+            for (file_path, st), (file_type, records, error) in zip(files, results):
+                self.logger.info(f"入库文件: {file_path.name}")
+                if self._skip_stored_in_batch(file_path, st):
+                    yield file_path, 'duplicate'
+                    continue
+                success = self.store_records(file_path, file_type, records,
+                                             error_message=error, st=st)
+                yield file_path, 'success' if success else 'failed'
+
     def show_stats(self):
         """
         显示数据库统计信息
@@ -353,6 +752,8 @@ def main():
     python etl_main.py --archive            # 处理后归档文件
     python etl_main.py --stats              # 显示统计信息
     python etl_main.py --data-dir /path     # 指定数据目录
+    python etl_main.py --workers 4          # 4 进程并行解析
+    python etl_main.py --pdf-workers 4      # 4 进程并行解析 PDF 页面
 
 数据库位置：
     data/cme_data.db
@@ -407,6 +808,20 @@ def main():
         help='静默模式：不输出到控制台'
     )
 
+    parser.add_argument(
+        '--workers',
+        type=int,
+        default=1,
+        help='并行解析文件的进程数（默认 1，即串行处理）'
+    )
+
+    parser.add_argument(
+        '--pdf-workers',
+        type=int,
+        default=1,
+        help='并行解析单个 PDF 各页的进程数（默认 1；0 表示按 CPU 核数自动选择；仅在 --workers 为 1 时生效）'
+    )
+
     args = parser.parse_args()
 
     # 配置日志
@@ -417,7 +832,8 @@ def main():
         data_dir=args.data_dir,
         db_path=args.db_path,
         archive_dir=args.archive_dir if args.archive else None,
-        logger=logger
+        logger=logger,
+        pdf_workers=args.pdf_workers
     )
 
     # 仅显示统计信息
@@ -427,7 +843,8 @@ def main():
 
     # 执行 ETL 处理
     try:
-        etl.process_all(reprocess=args.reprocess, archive=args.archive)
+        etl.process_all(reprocess=args.reprocess, archive=args.archive,
+                        workers=args.workers)
         return 0
 
     except KeyboardInterrupt:
@@ -75,7 +75,7 @@ def main():
             logger.info(f"配置文件数量: {len(DOWNLOAD_FILES)}")
             print("\n配置的文件列表:")
             for i, file_config in enumerate(DOWNLOAD_FILES, 1):
-                print(f"{i}. {file_config['name']} ({file_config['description']})")
+                print(f"{i}. {file_config.name} ({file_config.description})")
             return 0
         except Exception as e:
             logger.error(f"✗ 配置验证失败: {e}")
@@ -94,9 +94,8 @@ def main():
         if args.test:
             # 测试模式：仅解析链接
             logger.info("运行在测试模式 - 仅解析链接，不下载文件")
-            html_content = downloader.fetch_page_content()
-            if html_content:
-                download_links = downloader.parse_download_links(html_content)
+            download_links = downloader.get_download_links()
+            if download_links is not None:
                 logger.info("\n解析结果:")
                 for file_id, url in download_links.items():
                     status = "✓" if url else "✗"
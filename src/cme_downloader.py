@@ -14,14 +14,19 @@ CME 数据下载器核心模块
 
 import os
 import re
+import json
+import hashlib
 import time
 import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime
 from pathlib import Path
 from typing import List, Dict, Optional, Tuple
 from urllib.parse import urljoin, urlparse
 
 import requests
+from requests.adapters import HTTPAdapter
 from bs4 import BeautifulSoup
 
 # 导入配置
@@ -36,10 +41,21 @@ from config import (
     DATE_FORMAT,
     DUPLICATE_STRATEGY,
     MIN_FILE_SIZE,
-    DOWNLOAD_FILES
+    DOWNLOAD_CHUNK_SIZE,
+    PREALLOCATE_MIN_SIZE,
+    DOWNLOAD_WORKERS,
+    ETAG_CACHE_FILENAME,
+    PAGE_CACHE_FILENAME,
+    PAGE_CACHE_TTL,
+    DOWNLOAD_FILES,
+    DownloadFile
 )
 
 
+# 可直接下载的文件扩展名
+_ALLOWED_EXTS = ('.pdf', '.xls', '.xlsx', '.csv')
+
+
 class CMEDownloader:
     """
     CME 数据下载器主类
@@ -64,6 +80,14 @@ class CMEDownloader:
         self.download_date = datetime.now().strftime(DATE_FORMAT)
         self.download_results = []  # 存储下载结果，便于后续数据库插入
 
+        # 条件请求缓存：file_id -> {url, etag, last_modified, filepath}
+        self._etag_cache_path = DATA_ROOT / ETAG_CACHE_FILENAME
+        self._etag_cache = self._load_json_cache(self._etag_cache_path)
+        self._etag_lock = threading.Lock()
+
+        # 页面解析缓存：{html_sha1, etag, links, ts}
+        self._page_cache_path = DATA_ROOT / PAGE_CACHE_FILENAME
+
     def _create_session(self) -> requests.Session:
         """
         创建并配置 requests session
@@ -71,15 +95,65 @@ class CMEDownloader:
         """
         session = requests.Session()
         session.headers.update(REQUEST_HEADERS)
+
+        # 连接池：保持 keep-alive 连接复用，避免每次请求重新握手
+        # 连接池大小与并行下载线程数一致；重试由 _retry_request 负责
+        adapter = HTTPAdapter(
+            pool_connections=4,
+            pool_maxsize=DOWNLOAD_WORKERS,
+            max_retries=0
+        )
+        session.mount('https://', adapter)
+        session.mount('http://', adapter)
         return session
 
-    def _retry_request(self, url: str, max_retries: int = MAX_RETRIES) -> Optional[requests.Response]:
+    def _load_json_cache(self, path: Path) -> Dict:
+        """
+        读取 JSON 缓存文件
+
+        Args:
+            path: 缓存文件路径
+
+        Returns:
+            缓存字典，文件不存在或损坏时返回空字典
+        """
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return {}
+        except (OSError, ValueError) as e:
+            self.logger.warning(f"读取缓存文件失败，将忽略: {path} ({e})")
+            return {}
+
+    def _save_json_cache(self, path: Path, data: Dict):
+        """
+        写入 JSON 缓存文件（先写临时文件再替换，避免写入中断损坏缓存）
+
+        Args:
+            path: 缓存文件路径
+            data: 缓存字典
+        """
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            temp_path = path.with_name(path.name + ".tmp")
+            with open(temp_path, 'w', encoding='utf-8') as f:
+                json.dump(data, f, ensure_ascii=False, indent=2)
+            os.replace(temp_path, path)
+        except OSError as e:
+            self.logger.warning(f"写入缓存文件失败: {path} ({e})")
+
+    def _retry_request(self, url: str, max_retries: int = MAX_RETRIES,
+                       stream: bool = False,
+                       headers: Optional[Dict[str, str]] = None) -> Optional[requests.Response]:
         """
         带重试机制的 HTTP 请求
 
         Args:
             url: 请求 URL
             max_retries: 最大重试次数
+            stream: 是否流式读取响应体（调用方负责读取并关闭响应）
+            headers: 额外的请求头（如条件请求头）
 
         Returns:
             响应对象，失败返回 None
@@ -87,8 +161,13 @@ class CMEDownloader:
         for attempt in range(max_retries):
             try:
                 self.logger.info(f"正在请求 URL: {url} (尝试 {attempt + 1}/{max_retries})")
-                response = self.session.get(url, timeout=REQUEST_TIMEOUT)
-                response.raise_for_status()
+                response = self.session.get(url, timeout=REQUEST_TIMEOUT, stream=stream,
+                                            headers=headers)
+                try:
+                    response.raise_for_status()
+                except requests.exceptions.HTTPError:
+                    response.close()
+                    raise
                 return response
             except requests.exceptions.RequestException as e:
                 self.logger.warning(f"请求失败 (尝试 {attempt + 1}/{max_retries}): {e}")
@@ -98,18 +177,98 @@ class CMEDownloader:
                     self.logger.error(f"请求最终失败: {url}")
         return None
 
-    def fetch_page_content(self) -> Optional[str]:
+    def _head(self, url: str) -> Tuple[Optional[int], Dict[str, str]]:
+        """
+        发送 HEAD 请求获取响应头（不下载响应体）
+
+        Args:
+            url: 请求 URL
+
+        Returns:
+            (状态码, 响应头)，请求失败返回 (None, {})
+        """
+        try:
+            response = self.session.head(url, timeout=REQUEST_TIMEOUT, allow_redirects=True)
+            return response.status_code, response.headers
+        except requests.exceptions.RequestException as e:
+            self.logger.debug(f"HEAD 请求失败: {url} ({e})")
+            return None, {}
+
+    def _preflight_check(self, url: str) -> Optional[str]:
         """
-        获取 CME 主页面内容
+        下载前通过 HEAD 检查响应，提前排除过小的文件
+
+        检查结果仅供参考：HEAD 请求失败、服务器不支持或响应类型异常
+        （部分服务器/CDN 对 HEAD 返回 text/html）时只记录警告，交由正式下载处理。
+
+        Args:
+            url: 下载 URL
 
         Returns:
-            页面 HTML 内容，失败返回 None
+            应跳过下载时返回错误信息，否则返回 None
         """
-        response = self._retry_request(CME_DELIVERY_NOTICES_URL)
-        if response:
-            return response.text
+        status, headers = self._head(url)
+        if status is None or status >= 400:
+            return None
+
+        content_type = headers.get('Content-Type', '').lower()
+        if content_type.startswith('text/html'):
+            self.logger.warning(f"HEAD 响应类型异常: {content_type}（可能是错误页面），继续下载")
+
+        try:
+            content_length = int(headers.get('Content-Length', 0))
+        except ValueError:
+            content_length = 0
+        if content_length and content_length < MIN_FILE_SIZE:
+            return f"文件大小异常: {content_length} 字节 (最小要求: {MIN_FILE_SIZE} 字节)"
+
         return None
 
+    def get_download_links(self) -> Optional[Dict[str, Optional[str]]]:
+        """
+        获取下载链接（页面内容未变化时复用上次的解析结果）
+
+        缓存有效期内发送 If-None-Match 条件请求；页面返回 304 或内容
+        SHA-1 与上次一致时跳过 HTML 解析。
+
+        Returns:
+            下载链接字典，无法获取页面时返回 None
+        """
+        cache = self._load_json_cache(self._page_cache_path)
+        links = cache.get('links')
+        cache_valid = (
+            isinstance(links, dict)
+            and set(links) == {file_config.id for file_config in DOWNLOAD_FILES}
+            and time.time() - cache.get('ts', 0) < PAGE_CACHE_TTL
+        )
+
+        headers = None
+        if cache_valid and cache.get('etag'):
+            headers = {'If-None-Match': cache['etag']}
+
+        response = self._retry_request(CME_DELIVERY_NOTICES_URL, headers=headers)
+        if not response:
+            return None
+
+        if response.status_code == 304 and cache_valid:
+            self.logger.info("页面未更新（304），使用缓存的下载链接")
+            return links
+
+        html_content = response.text
+        html_sha1 = hashlib.sha1(html_content.encode('utf-8')).hexdigest()
+        if cache_valid and cache.get('html_sha1') == html_sha1:
+            self.logger.info("页面内容未变化，使用缓存的下载链接")
+            return links
+
+        links = self.parse_download_links(html_content)
+        self._save_json_cache(self._page_cache_path, {
+            'html_sha1': html_sha1,
+            'etag': response.headers.get('ETag'),
+            'links': links,
+            'ts': time.time()
+        })
+        return links
+
     def parse_download_links(self, html_content: str) -> Dict[str, Optional[str]]:
         """
         解析页面，提取下载链接
@@ -120,42 +279,51 @@ class CMEDownloader:
         Returns:
             字典，key 为文件 ID，value 为下载 URL
         """
-        soup = BeautifulSoup(html_content, 'html.parser')
+        # lxml 为 C 实现的解析器，比 html.parser 快得多
+        soup = BeautifulSoup(html_content, 'lxml')
         download_links = {}
 
-        for file_config in DOWNLOAD_FILES:
-            file_id = file_config["id"]
-            keyword = file_config["keyword"]
-            file_type = file_config["file_type"]
-
-            self.logger.info(f"正在查找文件: {file_config['name']} (关键词: {keyword})")
-
-            # 查找所有包含关键词的链接
-            # 优先查找 <a> 标签中文本包含关键词的链接
-            link = None
-
-            # 策略1: 查找 <a> 标签文本直接匹配
-            for a_tag in soup.find_all('a', href=True):
-                link_text = a_tag.get_text(strip=True)
-                if keyword.lower() in link_text.lower():
-                    href = a_tag['href']
-                    # 检查是否是预期的文件类型
-                    if file_type in href.lower() or href.endswith(('.pdf', '.xls', '.xlsx', '.csv')):
-                        link = href
-                        self.logger.info(f"找到链接: {link_text} -> {link}")
-                        break
-
-            # 策略2: 如果策略1失败，尝试更宽松的匹配
-            if not link:
-                for a_tag in soup.find_all('a', href=True):
-                    href = a_tag['href']
-                    link_text = a_tag.get_text(strip=True)
-                    # 检查 href 或 link_text 是否包含关键词
-                    if (keyword.lower() in link_text.lower() or keyword.lower() in href.lower()):
-                        if file_type in href.lower() or href.endswith(('.pdf', '.xls', '.xlsx', '.csv')):
-                            link = href
-                            self.logger.info(f"找到链接（宽松匹配）: {link_text} -> {link}")
-                            break
+        # 只遍历一次 DOM，预先提取 (href, 文本, 小写文本, 小写 href)
+        anchors = []
+        for a_tag in soup.find_all('a', href=True):
+            href = a_tag['href']
+            link_text = a_tag.get_text(strip=True)
+            anchors.append((href, link_text, link_text.lower(), href.lower()))
+
+        # 预先转换关键词和文件类型为小写，避免在链接循环中重复计算
+        configs = [(file_config, file_config.keyword.lower(), file_config.file_type.lower())
+                   for file_config in DOWNLOAD_FILES]
+
+        for file_config, keyword_lower, file_type in configs:
+            file_id = file_config.id
+            keyword = file_config.keyword
+
+            self.logger.info(f"正在查找文件: {file_config.name} (关键词: {keyword})")
+
+            # 单次遍历打分：文本匹配关键词得 2 分（直接采用），
+            # 仅 href 匹配得 1 分（宽松匹配，保留第一个作为备选）
+            best_score, link, best_text = 0, None, None
+
+            for href, link_text, text_lower, href_lower in anchors:
+                if keyword_lower in text_lower:
+                    score = 2
+                elif best_score == 0 and keyword_lower in href_lower:
+                    score = 1
+                else:
+                    continue
+
+                # 检查是否是预期的文件类型
+                if not (file_type in href_lower or href.endswith(_ALLOWED_EXTS)):
+                    continue
+
+                best_score, link, best_text = score, href, link_text
+                if score == 2:
+                    break
+
+            if best_score == 2:
+                self.logger.info(f"找到链接: {best_text} -> {link}")
+            elif best_score == 1:
+                self.logger.info(f"找到链接（宽松匹配）: {best_text} -> {link}")
 
             if link:
                 # 如果是相对路径，转换为绝对路径
@@ -163,18 +331,18 @@ class CMEDownloader:
                     link = urljoin(CME_BASE_URL, link)
                 download_links[file_id] = link
             else:
-                self.logger.warning(f"未找到文件: {file_config['name']}")
+                self.logger.warning(f"未找到文件: {file_config.name}")
                 download_links[file_id] = None
 
         return download_links
 
-    def _generate_filename(self, file_config: Dict, original_url: str) -> str:
+    def _generate_filename(self, file_config: DownloadFile, original_url: str) -> str:
         """
         生成规范化的文件名
         格式: YYYYMMDD_prefix_original_name.ext
 
         Args:
-            file_config: 文件配置字典
+            file_config: 文件配置
             original_url: 原始下载 URL
 
         Returns:
@@ -186,26 +354,91 @@ class CMEDownloader:
 
         # 如果 URL 中没有文件名，使用默认命名
         if not original_filename or '.' not in original_filename:
-            ext = file_config['file_type']
-            original_filename = f"{file_config['prefix']}.{ext}"
+            ext = file_config.file_type
+            original_filename = f"{file_config.prefix}.{ext}"
 
         # 移除文件名中的特殊字符
         original_filename = re.sub(r'[^\w\-_\.]', '_', original_filename)
 
         # 组合新文件名: 日期_前缀_原文件名
         # 例如: 20240113_metal_delivery_daily_report.pdf
-        prefix = file_config['prefix']
+        prefix = file_config.prefix
         new_filename = f"{self.download_date}_{prefix}_{original_filename}"
 
         return new_filename
 
-    def download_file(self, url: str, file_config: Dict) -> Tuple[bool, Optional[str], Optional[str]]:
+    def _get_etag_entry(self, file_id: str, url: str) -> Optional[Dict]:
+        """
+        获取可用于条件请求的缓存条目
+
+        仅当 URL 未变化且上次下载的文件仍然存在时才返回
+
+        Args:
+            file_id: 文件 ID
+            url: 本次下载 URL
+
+        Returns:
+            缓存条目，不可用时返回 None
+        """
+        with self._etag_lock:
+            entry = self._etag_cache.get(file_id)
+
+        if not entry or entry.get('url') != url:
+            return None
+        if not (entry.get('etag') or entry.get('last_modified')):
+            return None
+        if not entry.get('filepath') or not os.path.exists(entry['filepath']):
+            return None
+        return entry
+
+    def _update_etag_entry(self, file_id: str, url: str, headers, filepath: Path):
+        """
+        记录下载文件的 ETag / Last-Modified 并持久化缓存
+
+        Args:
+            file_id: 文件 ID
+            url: 下载 URL
+            headers: 响应头
+            filepath: 保存路径
+        """
+        with self._etag_lock:
+            self._etag_cache[file_id] = {
+                'url': url,
+                'etag': headers.get('ETag'),
+                'last_modified': headers.get('Last-Modified'),
+                'filepath': str(filepath)
+            }
+            self._save_json_cache(self._etag_cache_path, self._etag_cache)
+
+    @staticmethod
+    def _preallocate(f, content_length: Optional[str]):
+        """
+        按 Content-Length 预分配磁盘空间（仅支持 posix_fallocate 的平台）
+
+        大文件一次性分配连续空间，减少写入过程中的块分配和碎片；
+        小文件或长度未知时直接跳过。
+
+        Args:
+            f: 已打开的二进制文件对象
+            content_length: 响应头中的 Content-Length
+        """
+        if not hasattr(os, 'posix_fallocate') or not content_length:
+            return
+
+        try:
+            size = int(content_length)
+            if size >= PREALLOCATE_MIN_SIZE:
+                os.posix_fallocate(f.fileno(), 0, size)
+        except (ValueError, OSError):
+            pass
+
+    def download_file(self, url: str, file_config: DownloadFile) -> Tuple[bool, Optional[str], Optional[str]]:
         """
         下载单个文件
 
         Args:
             url: 下载 URL
-            file_config: 文件配置字典
+            file_config: 文件配置
 
         Returns:
             (成功标志, 保存路径, 错误信息)
@@ -226,23 +459,64 @@ class CMEDownloader:
                 elif DUPLICATE_STRATEGY == "overwrite":
                     self.logger.info(f"文件已存在，将覆盖: {filename}")
 
-            # 下载文件
+            # 条件请求：服务器文件未更新时返回 304，无需重新传输
+            file_id = file_config.id
+            cached = self._get_etag_entry(file_id, url)
+            conditional_headers = {}
+            if cached:
+                if cached.get('etag'):
+                    conditional_headers['If-None-Match'] = cached['etag']
+                if cached.get('last_modified'):
+                    conditional_headers['If-Modified-Since'] = cached['last_modified']
+
+            # 预检：过小的文件无需下载响应体
+            # 发送条件请求时跳过（文件未更新时 GET 直接返回 304，预检只会多一次往返）
+            if not conditional_headers:
+                preflight_error = self._preflight_check(url)
+                if preflight_error:
+                    self.logger.error(f"{preflight_error}，跳过下载: {filename}")
+                    return False, None, preflight_error
+
+            # 下载文件（流式写入临时文件，内存占用仅为单个数据块大小）
             self.logger.info(f"正在下载: {filename}")
-            response = self._retry_request(url)
+            response = self._retry_request(url, stream=True,
+                                           headers=conditional_headers or None)
 
             if not response:
                 return False, None, "下载请求失败"
 
+            if response.status_code == 304:
+                response.close()
+                self.logger.info(f"文件未更新（304），跳过下载: {cached['filepath']}")
+                return True, cached['filepath'], None
+
+            temp_path = filepath.with_name(filepath.name + ".part")
+            content_length = 0
+            try:
+                with open(temp_path, 'wb') as f:
+                    self._preallocate(f, response.headers.get('Content-Length'))
+                    for chunk in response.iter_content(chunk_size=DOWNLOAD_CHUNK_SIZE):
+                        f.write(chunk)
+                        content_length += len(chunk)
+                    # 按实际写入长度截断（预分配长度可能与解压后长度不同）
+                    f.truncate()
+            except Exception:
+                temp_path.unlink(missing_ok=True)
+                raise
+            finally:
+                response.close()
+
             # 验证文件大小
-            content_length = len(response.content)
             if content_length < MIN_FILE_SIZE:
+                temp_path.unlink(missing_ok=True)
                 error_msg = f"文件大小异常: {content_length} 字节 (最小要求: {MIN_FILE_SIZE} 字节)"
                 self.logger.error(error_msg)
                 return False, None, error_msg
 
-            # 保存文件
-            with open(filepath, 'wb') as f:
-                f.write(response.content)
+            # 下载完整后再替换目标文件，避免中途失败破坏已有文件
+            os.replace(temp_path, filepath)
+
+            self._update_etag_entry(file_id, url, response.headers, filepath)
 
             self.logger.info(f"下载成功: {filename} ({content_length} 字节)")
             return True, str(filepath), None
@@ -252,6 +526,38 @@ class CMEDownloader:
             self.logger.error(error_msg)
             return False, None, error_msg
 
+    def _download_one(self, file_config: DownloadFile, url: Optional[str]) -> Dict:
+        """
+        下载单个配置文件并生成结果记录
+
+        Args:
+            file_config: 文件配置
+            url: 下载 URL（未找到链接时为 None）
+
+        Returns:
+            下载结果字典
+        """
+        result = {
+            "file_id": file_config.id,
+            "file_name": file_config.name,
+            "url": url,
+            "success": False,
+            "filepath": None,
+            "error": None,
+            "timestamp": datetime.now().isoformat()
+        }
+
+        if url:
+            success, filepath, error = self.download_file(url, file_config)
+            result["success"] = success
+            result["filepath"] = filepath
+            result["error"] = error
+        else:
+            result["error"] = "未找到下载链接"
+            self.logger.error(f"跳过文件: {file_config.name} - 未找到下载链接")
+
+        return result
+
     def download_all(self) -> Dict:
         """
         下载所有配置的文件
@@ -264,9 +570,9 @@ class CMEDownloader:
         self.logger.info(f"开始下载任务 - {start_time.strftime('%Y-%m-%d %H:%M:%S')}")
         self.logger.info("="*60)
 
-        # 获取页面内容
-        html_content = self.fetch_page_content()
-        if not html_content:
+        # 获取页面并解析下载链接（页面未变化时使用缓存）
+        download_links = self.get_download_links()
+        if download_links is None:
             self.logger.error("无法获取 CME 页面内容，任务终止")
             return {
                 "success": False,
@@ -276,45 +582,23 @@ class CMEDownloader:
                 "results": []
             }
 
-        # 解析下载链接
-        download_links = self.parse_download_links(html_content)
-
-        # 下载所有文件
-        results = []
-        succeeded = 0
-        failed = 0
-
-        for file_config in DOWNLOAD_FILES:
-            file_id = file_config["id"]
-            url = download_links.get(file_id)
-
-            result = {
-                "file_id": file_id,
-                "file_name": file_config["name"],
-                "url": url,
-                "success": False,
-                "filepath": None,
-                "error": None,
-                "timestamp": datetime.now().isoformat()
+        # 并行下载所有文件（I/O 密集，线程等待网络时会释放 GIL）
+        max_workers = max(1, min(len(DOWNLOAD_FILES), DOWNLOAD_WORKERS))
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = {
+                executor.submit(self._download_one, file_config,
+                                download_links.get(file_config.id)): index
+                for index, file_config in enumerate(DOWNLOAD_FILES)
             }
+            indexed_results = [(futures[future], future.result())
+                               for future in as_completed(futures)]
 
-            if url:
-                success, filepath, error = self.download_file(url, file_config)
-                result["success"] = success
-                result["filepath"] = filepath
-                result["error"] = error
-
-                if success:
-                    succeeded += 1
-                else:
-                    failed += 1
-            else:
-                result["error"] = "未找到下载链接"
-                failed += 1
-                self.logger.error(f"跳过文件: {file_config['name']} - 未找到下载链接")
+        # 按配置顺序整理结果
+        results = [result for _, result in sorted(indexed_results, key=lambda x: x[0])]
+        self.download_results.extend(results)  # 保存到实例变量，便于数据库操作
 
-            results.append(result)
-            self.download_results.append(result)  # 保存到实例变量，便于数据库操作
+        succeeded = sum(1 for result in results if result["success"])
+        failed = len(results) - succeeded
 
         # 统计结果
         end_time = datetime.now()
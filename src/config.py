@@ -6,7 +6,10 @@
 """
 
 import os
+from dataclasses import dataclass
 from pathlib import Path
+from types import MappingProxyType
+from typing import Tuple
 
 # ==================== 基础路径配置 ====================
 # 项目根目录
@@ -28,60 +31,85 @@ CME_DELIVERY_NOTICES_URL = "https://www.cmegroup.com/solutions/clearing/operatio
 # ==================== 下载文件配置 ====================
 # 文件定义：包含名称、关键词、文件类型等信息
 # 结构设计支持后续数据库扩展（可以直接映射到数据库表）
-DOWNLOAD_FILES = [
-    {
-        "id": "metal_delivery_daily",
-        "name": "Metal Delivery Notices Daily",
-        "keyword": "Daily",
-        "section": "COMEX & NYMEX Metal Delivery Notices",
-        "file_type": "pdf",
-        "prefix": "metal_delivery_daily",
-        "description": "每日金属交割通知"
-    },
-    {
-        "id": "metal_delivery_monthly",
-        "name": "Metal Delivery Notices Monthly",
-        "keyword": "Monthly",
-        "section": "COMEX & NYMEX Metal Delivery Notices",
-        "file_type": "pdf",
-        "prefix": "metal_delivery_monthly",
-        "description": "月度金属交割通知"
-    },
-    {
-        "id": "metal_delivery_ytd",
-        "name": "Metal Delivery Notices YTD",
-        "keyword": "Year-To-Date",
-        "section": "COMEX & NYMEX Metal Delivery Notices",
-        "file_type": "pdf",
-        "prefix": "metal_delivery_ytd",
-        "description": "年度至今金属交割通知"
-    },
-    {
-        "id": "gold_stocks",
-        "name": "Gold Stocks",
-        "keyword": "Gold Stocks",
-        "section": "Warehouse & Depository Stocks",
-        "file_type": "xls",  # 可能是 xls 或 csv
-        "prefix": "gold_stocks",
-        "description": "黄金库存数据"
-    },
-    {
-        "id": "silver_stocks",
-        "name": "Silver Stocks",
-        "keyword": "Silver Stocks",
-        "section": "Warehouse & Depository Stocks",
-        "file_type": "xls",  # 可能是 xls 或 csv
-        "prefix": "silver_stocks",
-        "description": "白银库存数据"
-    }
-]
+@dataclass(frozen=True)
+class DownloadFile:
+    """
+    下载文件定义（不可变，可在线程间安全共享）
+
+    Attributes:
+        id: 文件唯一标识
+        name: 显示名称
+        keyword: 页面链接匹配关键词
+        section: 页面所在板块
+        file_type: 默认文件类型（pdf, xls, csv）
+        prefix: 保存文件名前缀
+        description: 说明
+    """
+    __slots__ = ('id', 'name', 'keyword', 'section', 'file_type', 'prefix', 'description')
+
+    id: str
+    name: str
+    keyword: str
+    section: str
+    file_type: str
+    prefix: str
+    description: str
+
+
+DOWNLOAD_FILES: Tuple[DownloadFile, ...] = (
+    DownloadFile(
+        id="metal_delivery_daily",
+        name="Metal Delivery Notices Daily",
+        keyword="Daily",
+        section="COMEX & NYMEX Metal Delivery Notices",
+        file_type="pdf",
+        prefix="metal_delivery_daily",
+        description="每日金属交割通知"
+    ),
+    DownloadFile(
+        id="metal_delivery_monthly",
+        name="Metal Delivery Notices Monthly",
+        keyword="Monthly",
+        section="COMEX & NYMEX Metal Delivery Notices",
+        file_type="pdf",
+        prefix="metal_delivery_monthly",
+        description="月度金属交割通知"
+    ),
+    DownloadFile(
+        id="metal_delivery_ytd",
+        name="Metal Delivery Notices YTD",
+        keyword="Year-To-Date",
+        section="COMEX & NYMEX Metal Delivery Notices",
+        file_type="pdf",
+        prefix="metal_delivery_ytd",
+        description="年度至今金属交割通知"
+    ),
+    DownloadFile(
+        id="gold_stocks",
+        name="Gold Stocks",
+        keyword="Gold Stocks",
+        section="Warehouse & Depository Stocks",
+        file_type="xls",  # 可能是 xls 或 csv
+        prefix="gold_stocks",
+        description="黄金库存数据"
+    ),
+    DownloadFile(
+        id="silver_stocks",
+        name="Silver Stocks",
+        keyword="Silver Stocks",
+        section="Warehouse & Depository Stocks",
+        file_type="xls",  # 可能是 xls 或 csv
+        prefix="silver_stocks",
+        description="白银库存数据"
+    )
+)
 
 # ==================== HTTP 请求配置 ====================
 # User-Agent 配置（反爬虫）
 USER_AGENT = "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
 
-# 请求头
-REQUEST_HEADERS = {
+# 请求头（只读）
+REQUEST_HEADERS = MappingProxyType({
     "User-Agent": USER_AGENT,
     "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8",
     "Accept-Language": "en-US,en;q=0.5",
@@ -92,7 +120,7 @@ REQUEST_HEADERS = {
     "Sec-Fetch-Mode": "navigate",
     "Sec-Fetch-Site": "none",
     "Cache-Control": "max-age=0"
-}
+})
 
 # 请求超时设置（秒）
 REQUEST_TIMEOUT = 30
@@ -101,6 +129,9 @@ REQUEST_TIMEOUT = 30
 MAX_RETRIES = 3
 RETRY_DELAY = 2  # 秒
 
+# 并行下载的最大线程数
+DOWNLOAD_WORKERS = 8
+
 # ==================== 文件处理配置 ====================
 # 日期格式（用于文件名前缀）
 DATE_FORMAT = "%Y%m%d"
@@ -111,6 +142,25 @@ DATE_FORMAT = "%Y%m%d"
 # "append": 添加序号（如 _1, _2）
 DUPLICATE_STRATEGY = "overwrite"
 
+# 条件请求缓存文件名（保存在 DATA_ROOT 下，记录各文件的 ETag / Last-Modified）
+ETAG_CACHE_FILENAME = ".etag_cache.json"
+
+# 页面解析缓存文件名（保存在 DATA_ROOT 下，页面内容未变化时复用上次解析出的下载链接）
+PAGE_CACHE_FILENAME = ".page_cache.json"
+
+# 页面解析缓存有效期（秒）
+PAGE_CACHE_TTL = 3600
+
+# ==================== 归档配置（ETL）====================
+# 归档方式（etl_main.py --archive 时生效）
+# "files": 逐个移动文件到 archive/YYYY-MM/
+# "tar": 处理完成后统一打包为 archive/YYYY-MM/archive_YYYY-MM_时间戳.tar.zst
+#        （需要安装 zstandard，未安装时使用 .tar.gz）
+ARCHIVE_MODE = "files"
+
+# zstd 压缩级别（ARCHIVE_MODE = "tar" 时使用）
+ARCHIVE_ZSTD_LEVEL = 3
+
 # ==================== 日志配置 ====================
 # 日志级别: DEBUG, INFO, WARNING, ERROR, CRITICAL
 LOG_LEVEL = "INFO"
@@ -165,6 +215,12 @@ VERIFY_FILE_INTEGRITY = True
 # 最小文件大小（字节），小于此大小认为下载失败
 MIN_FILE_SIZE = 1024  # 1KB
 
+# 流式下载时每次读取的数据块大小（字节）
+DOWNLOAD_CHUNK_SIZE = 64 * 1024  # 64KB
+
+# 大于此大小的文件在下载前按 Content-Length 预分配磁盘空间
+PREALLOCATE_MIN_SIZE = 1024 * 1024  # 1MB
+
 
 def validate_config():
     """
@@ -191,22 +247,24 @@ def validate_config():
     return True
 
 
+# 按 ID 索引的下载文件配置（导入时构建一次）
+_FILES_BY_ID = {file_config.id: file_config for file_config in DOWNLOAD_FILES}
+_ALL_IDS = tuple(file_config.id for file_config in DOWNLOAD_FILES)
+
+
 def get_download_file_by_id(file_id):
     """
     根据 ID 获取下载文件配置
     便于后续数据库查询和管理
     """
-    for file_config in DOWNLOAD_FILES:
-        if file_config["id"] == file_id:
-            return file_config
-    return None
+    return _FILES_BY_ID.get(file_id)
 
 
 def get_all_file_ids():
     """
-    获取所有文件 ID 列表
+    获取所有文件 ID 列表（元组，不可修改）
     """
-    return [file_config["id"] for file_config in DOWNLOAD_FILES]
+    return _ALL_IDS
 
 
 if __name__ == "__main__":
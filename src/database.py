@@ -5,20 +5,154 @@
 负责 SQLite 数据库的连接、表创建和数据操作
 """
 
+import atexit
 import sqlite3
 import logging
+import threading
+from itertools import islice, product as iter_product
+from operator import itemgetter
 from pathlib import Path
-from typing import List, Dict, Optional, Any
-from datetime import datetime
+from typing import List, Dict, Optional, Any, Set, FrozenSet, Union, Iterable, Iterator, Tuple
 from contextlib import contextmanager
 
+from records import ColumnBuffer, INVENTORY_FIELDS, DELIVERY_FIELDS
+
+
+# 连接级参数（每个连接生效，建立连接时设置一次）
+_CONNECTION_PRAGMAS = (
+    # WAL 模式下 NORMAL 同步级别是安全的，可减少每次提交的 fsync
+    "PRAGMA synchronous=NORMAL",
+    # 临时表和排序使用内存
+    "PRAGMA temp_store=MEMORY",
+    # 页缓存约 64 MB（负数表示 KiB）
+    "PRAGMA cache_size=-64000",
+    # 内存映射读取，最多 256 MB
+    "PRAGMA mmap_size=268435456",
+    # 数据库被其他进程锁定时最多等待 5 秒
+    "PRAGMA busy_timeout=5000",
+)
+
+# 数据库结构版本（记录在 PRAGMA user_version 中；修改表结构或索引时递增）
+SCHEMA_VERSION = 2
+
+# 批量插入时每个事务的最大行数（限制单个事务的 WAL 增长）
+INSERT_BATCH_SIZE = 5000
+
+# 文件处理日志缓冲的自动写入阈值（条数）
+LOG_FLUSH_THRESHOLD = 100
+
+# 流式查询时每次从游标读取的行数
+FETCH_BATCH_SIZE = 1000
+
+# 连接的预编译语句缓存容量
+STATEMENT_CACHE_SIZE = 256
+
+# 视为"已处理"的文件状态（成功入库，或内容与已入库文件相同）
+PROCESSED_STATUSES = frozenset(('success', 'duplicate'))
+
+# 常用 SQL 语句（模块级常量，保证文本一致以命中语句缓存）
+_SQL_INSERT_INVENTORY = """
+INSERT OR REPLACE INTO inventory_history
+(activity_date, product, depository, registered, eligible, total, unit, report_date)
+VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+_SQL_INSERT_DELIVERY = """
+INSERT OR REPLACE INTO delivery_notices
+(intent_date, product, contract_month, daily_total, cumulative, report_type, source_file)
+VALUES (?, ?, ?, ?, ?, ?, ?)
+"""
+
+_SQL_LOG_FILE = """
+INSERT OR REPLACE INTO file_processing_log
+(file_path, file_name, file_type, file_size, status, records_inserted, error_message,
+ content_sha1)
+VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+_SQL_PROCESSED_PATHS = (
+    "SELECT file_path FROM file_processing_log "
+    f"WHERE status IN ({', '.join(repr(status) for status in sorted(PROCESSED_STATUSES))})"
+)
+
+
+def _dict_rows(records: Iterable[Dict[str, Any]],
+               fields: Tuple[str, ...]) -> Iterator[Tuple[Any, ...]]:
+    """
+    将字典记录按字段顺序转换为参数元组
+
+    使用 itemgetter 一次取出全部字段；缺少字段的记录回退为 get（缺失值为 None）
+
+    Args:
+        records: 字典记录
+        fields: 字段顺序
+
+    Yields:
+        参数元组
+    """
+    getter = itemgetter(*fields)
+    for record in records:
+        try:
+            yield getter(record)
+        except KeyError:
+            yield tuple(record.get(field) for field in fields)
+
+
+def _build_filtered_sql(base: str, conditions: Tuple[str, ...],
+                        order_by: str) -> Dict[Tuple[bool, ...], str]:
+    """
+    预先生成所有筛选条件组合的 SQL 语句
+
+    Args:
+        base: SELECT ... FROM ... 部分
+        conditions: 各筛选条件（按参数顺序）
+        order_by: ORDER BY 子句内容
+
+    Returns:
+        (各条件是否启用) -> SQL 语句
+    """
+    variants = {}
+    for flags in iter_product((False, True), repeat=len(conditions)):
+        enabled = [condition for condition, flag in zip(conditions, flags) if flag]
+        where = f" WHERE {' AND '.join(enabled)}" if enabled else ""
+        variants[flags] = f"{base}{where} ORDER BY {order_by}"
+    return variants
+
+
+_SQL_INVENTORY_SUMMARY = _build_filtered_sql(
+    "SELECT * FROM inventory_history",
+    ("product = ?", "activity_date >= ?", "activity_date <= ?"),
+    "activity_date DESC, product, depository"
+)
+
+_SQL_DELIVERY_SUMMARY = _build_filtered_sql(
+    "SELECT * FROM delivery_notices",
+    ("product LIKE ?", "report_type = ?"),
+    "intent_date DESC, product"
+)
+
+_SQL_PROCESSING_STATS = """
+SELECT
+    COUNT(*),
+    COALESCE(SUM(status = 'success'), 0),
+    COALESCE(SUM(status = 'failed'), 0),
+    (SELECT COUNT(*) FROM inventory_history),
+    (SELECT COUNT(*) FROM delivery_notices)
+FROM file_processing_log
+"""
+
+_SQL_PROCESSED_HASHES = (
+    "SELECT content_sha1 FROM file_processing_log "
+    "WHERE status = 'success' AND content_sha1 IS NOT NULL"
+)
+
 
 class DatabaseManager:
     """
     SQLite 数据库管理器
 
     功能：
-    - 数据库连接管理
+    - 数据库连接管理（整个生命周期复用同一个连接）
     - 表结构创建和维护
     - 数据插入和查询
     - 事务管理
@@ -35,37 +169,100 @@ class DatabaseManager:
         self.db_path = db_path
         self.logger = logger or logging.getLogger(__name__)
 
+        self._lock = threading.RLock()
+        self._conn: Optional[sqlite3.Connection] = None
+
+        # 文件处理日志缓冲：批量写入，查询前和关闭时自动写入
+        self._pending_logs: List[Tuple[Any, ...]] = []
+
+        # 已处理文件路径缓存：首次查询时加载，记录处理日志时同步更新
+        self._processed_paths: Optional[Set[str]] = None
+
         # 确保数据库目录存在
         self.db_path.parent.mkdir(parents=True, exist_ok=True)
 
+        # 长连接：保留 SQLite 的页缓存和语句缓存，避免每次操作重新打开数据库
+        # 事务由 get_connection 显式管理（isolation_level=None）
+        self._conn = self._connect()
+        atexit.register(self.close)
+
         # 初始化数据库
         self._initialize_database()
 
+    def _connect(self) -> sqlite3.Connection:
+        """
+        创建数据库连接并设置连接参数
+
+        Returns:
+            SQLite 连接对象
+        """
+        conn = sqlite3.connect(self.db_path, check_same_thread=False, isolation_level=None,
+                               cached_statements=STATEMENT_CACHE_SIZE)
+
+        # 启用 WAL 日志模式（持久化到数据库文件；不能在事务中切换）
+        journal_mode = conn.execute("PRAGMA journal_mode=WAL").fetchone()[0]
+        if journal_mode.lower() != 'wal':
+            self.logger.warning(f"无法启用 WAL 模式，当前日志模式: {journal_mode}")
+
+        for pragma in _CONNECTION_PRAGMAS:
+            conn.execute(pragma)
+
+        # 行对象支持按列名访问（C 实现，无需逐行构建 zip 字典）
+        conn.row_factory = sqlite3.Row
+        return conn
+
     @contextmanager
     def get_connection(self):
         """
-        上下文管理器：获取数据库连接
+        上下文管理器：在一个事务中使用数据库连接
+
+        嵌套调用时复用外层事务，由最外层负责提交或回滚。
+        任何方式退出（包括 KeyboardInterrupt、生成器关闭）都会结束事务，
+        避免长连接停留在未结束的事务中。
 
         使用示例：
             with db_manager.get_connection() as conn:
                 cursor = conn.cursor()
                 cursor.execute("SELECT * FROM ...")
         """
-        conn = sqlite3.connect(self.db_path)
-        try:
-            yield conn
-            conn.commit()
-        except Exception as e:
-            conn.rollback()
-            self.logger.error(f"数据库操作失败: {e}")
-            raise
-        finally:
-            conn.close()
+        with self._lock:
+            conn = self._conn
+            if conn.in_transaction:
+                yield conn
+                return
+
+            conn.execute("BEGIN")
+            try:
+                yield conn
+                conn.execute("COMMIT")
+            except BaseException as e:
+                if conn.in_transaction:
+                    conn.execute("ROLLBACK")
+                if isinstance(e, Exception):
+                    self.logger.error(f"数据库操作失败: {e}")
+                raise
+
+    def close(self):
+        """
+        关闭数据库连接（可重复调用）
+        """
+        with self._lock:
+            if self._conn is not None:
+                self.flush_logs()
+                self._conn.close()
+                self._conn = None
+        atexit.unregister(self.close)
 
     def _initialize_database(self):
         """
         初始化数据库，创建所有必要的表
+
+        数据库结构版本已是最新时直接返回，不再重复执行建表语句
         """
+        user_version = self._conn.execute("PRAGMA user_version").fetchone()[0]
+        if user_version >= SCHEMA_VERSION:
+            return
+
         self.logger.info(f"初始化数据库: {self.db_path}")
 
         with self.get_connection() as conn:
@@ -80,6 +277,29 @@ class DatabaseManager:
             # 创建文件处理记录表（用于跟踪已处理的文件）
             cursor.execute(self._get_file_processing_log_schema())
 
+            # 兼容旧数据库：补充内容哈希列
+            cursor.execute("PRAGMA table_info(file_processing_log)")
+            log_columns = {row[1] for row in cursor.fetchall()}
+            if 'content_sha1' not in log_columns:
+                cursor.execute("ALTER TABLE file_processing_log ADD COLUMN content_sha1 CHAR(40)")
+
+            cursor.execute(
+                "CREATE INDEX IF NOT EXISTS ix_file_log_sha1 "
+                "ON file_processing_log(content_sha1)"
+            )
+
+            # 查询索引（库存按产品 + 日期范围查询；交割通知按报告类型查询并按日期排序）
+            cursor.execute(
+                "CREATE INDEX IF NOT EXISTS ix_inv_prod_date "
+                "ON inventory_history(product, activity_date DESC)"
+            )
+            cursor.execute(
+                "CREATE INDEX IF NOT EXISTS ix_deliv_type_date "
+                "ON delivery_notices(report_type, intent_date DESC)"
+            )
+
+            cursor.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+
             self.logger.info("数据库表结构创建完成")
 
     def _get_inventory_table_schema(self) -> str:
@@ -149,7 +369,7 @@ class DatabaseManager:
 
         用途：
         - 跟踪哪些文件已经被处理过
-        - 避免重复处理
+        - 避免重复处理（按路径，以及按内容 SHA-1 识别重新发布的相同文件）
         - 记录处理结果和错误信息
         """
         return """
@@ -162,16 +382,17 @@ class DatabaseManager:
             status VARCHAR(20) NOT NULL,
             records_inserted INTEGER DEFAULT 0,
             error_message TEXT,
+            content_sha1 CHAR(40),
             UNIQUE(file_path)
         )
         """
 
-    def insert_inventory_records(self, records: List[Dict[str, Any]]) -> int:
+    def insert_inventory_records(self, records: Union[ColumnBuffer, List[Dict[str, Any]]]) -> int:
         """
         批量插入库存记录
 
         Args:
-            records: 记录列表，每条记录是一个字典
+            records: 列式记录缓冲区，或记录列表（每条记录是一个字典）
 
         Returns:
             成功插入的记录数
@@ -180,40 +401,23 @@ class DatabaseManager:
             self.logger.warning("没有库存记录需要插入")
             return 0
 
-        with self.get_connection() as conn:
-            cursor = conn.cursor()
+        if isinstance(records, ColumnBuffer):
+            # 列式数据直接按列 zip 成元组，无需逐条构建字典
+            insert_data = records.rows(INVENTORY_FIELDS)
+        else:
+            insert_data = _dict_rows(records, INVENTORY_FIELDS)
+
+        count = self._executemany_in_batches(_SQL_INSERT_INVENTORY, insert_data)
+
+        self.logger.info(f"成功插入/更新 {count} 条库存记录")
+        return count
 
-            sql = """
-            INSERT OR REPLACE INTO inventory_history
-            (activity_date, product, depository, registered, eligible, total, unit, report_date)
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-            """
-
-            insert_data = []
-            for record in records:
-                insert_data.append((
-                    record.get('activity_date'),
-                    record.get('product'),
-                    record.get('depository'),
-                    record.get('registered'),
-                    record.get('eligible'),
-                    record.get('total'),
-                    record.get('unit'),
-                    record.get('report_date')
-                ))
-
-            cursor.executemany(sql, insert_data)
-            count = cursor.rowcount
-
-            self.logger.info(f"成功插入/更新 {count} 条库存记录")
-            return count
-
-    def insert_delivery_records(self, records: List[Dict[str, Any]]) -> int:
+    def insert_delivery_records(self, records: Union[ColumnBuffer, List[Dict[str, Any]]]) -> int:
         """
         批量插入交割通知记录
 
         Args:
-            records: 记录列表
+            records: 列式记录缓冲区，或记录列表（每条记录是一个字典）
 
         Returns:
             成功插入的记录数
@@ -222,36 +426,40 @@ class DatabaseManager:
             self.logger.warning("没有交割记录需要插入")
             return 0
 
-        with self.get_connection() as conn:
-            cursor = conn.cursor()
+        if isinstance(records, ColumnBuffer):
+            insert_data = records.rows(DELIVERY_FIELDS)
+        else:
+            insert_data = _dict_rows(records, DELIVERY_FIELDS)
+        count = self._executemany_in_batches(_SQL_INSERT_DELIVERY, insert_data)
 
-            sql = """
-            INSERT OR REPLACE INTO delivery_notices
-            (intent_date, product, contract_month, daily_total, cumulative, report_type, source_file)
-            VALUES (?, ?, ?, ?, ?, ?, ?)
-            """
-
-            insert_data = []
-            for record in records:
-                insert_data.append((
-                    record.get('intent_date'),
-                    record.get('product'),
-                    record.get('contract_month'),
-                    record.get('daily_total'),
-                    record.get('cumulative'),
-                    record.get('report_type'),
-                    record.get('source_file')
-                ))
-
-            cursor.executemany(sql, insert_data)
-            count = cursor.rowcount
-
-            self.logger.info(f"成功插入/更新 {count} 条交割记录")
-            return count
+        self.logger.info(f"成功插入/更新 {count} 条交割记录")
+        return count
+
+    def _executemany_in_batches(self, sql: str, rows: Iterable[Tuple[Any, ...]]) -> int:
+        """
+        分批执行 executemany，每批 INSERT_BATCH_SIZE 行、一个事务
+
+        Args:
+            sql: 带占位符的 SQL 语句
+            rows: 参数元组的可迭代对象（可以是生成器）
+
+        Returns:
+            受影响的总行数
+        """
+        rows = iter(rows)
+        count = 0
+        while True:
+            batch = list(islice(rows, INSERT_BATCH_SIZE))
+            if not batch:
+                break
+            with self.get_connection() as conn:
+                cursor = conn.executemany(sql, batch)
+                count += cursor.rowcount
+        return count
 
     def log_file_processing(self, file_path: str, file_name: str, file_type: str,
                            file_size: int, status: str, records_inserted: int = 0,
-                           error_message: str = None):
+                           error_message: str = None, content_sha1: str = None):
         """
         记录文件处理状态
 
@@ -260,20 +468,16 @@ class DatabaseManager:
             file_name: 文件名
             file_type: 文件类型（csv, xls, pdf）
             file_size: 文件大小（字节）
-            status: 处理状态（success, failed, skipped）
+            status: 处理状态（success, failed, skipped, duplicate）
             records_inserted: 插入的记录数
             error_message: 错误信息（如果有）
-        """
-        with self.get_connection() as conn:
-            cursor = conn.cursor()
+            content_sha1: 文件内容的 SHA-1（可选）
 
-            sql = """
-            INSERT OR REPLACE INTO file_processing_log
-            (file_path, file_name, file_type, file_size, status, records_inserted, error_message, processed_at)
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-            """
-
-            cursor.execute(sql, (
+        日志先写入缓冲区，累计 LOG_FLUSH_THRESHOLD 条、查询处理记录或关闭连接时
+        统一写入数据库（也可调用 flush_logs 立即写入）。
+        """
+        with self._lock:
+            self._pending_logs.append((
                 file_path,
                 file_name,
                 file_type,
@@ -281,14 +485,36 @@ class DatabaseManager:
                 status,
                 records_inserted,
                 error_message,
-                datetime.now().isoformat()
+                content_sha1
             ))
 
-            self.logger.info(f"文件处理日志已记录: {file_name} ({status})")
+            if self._processed_paths is not None:
+                if status in PROCESSED_STATUSES:
+                    self._processed_paths.add(file_path)
+                else:
+                    self._processed_paths.discard(file_path)
+
+            if len(self._pending_logs) >= LOG_FLUSH_THRESHOLD:
+                self.flush_logs()
+
+        self.logger.info(f"文件处理日志已记录: {file_name} ({status})")
+
+    def flush_logs(self):
+        """
+        将缓冲的文件处理日志写入数据库（一个事务）
+        """
+        with self._lock:
+            if not self._pending_logs:
+                return
+
+            with self.get_connection() as conn:
+                conn.executemany(_SQL_LOG_FILE, self._pending_logs)
+
+            self._pending_logs.clear()
 
     def is_file_processed(self, file_path: str) -> bool:
         """
-        检查文件是否已经被处理过
+        检查文件是否已经被处理过（成功入库，或内容与已入库文件相同）
 
         Args:
             file_path: 文件路径
@@ -296,92 +522,148 @@ class DatabaseManager:
         Returns:
             True 如果文件已处理，False 否则
         """
-        with self.get_connection() as conn:
-            cursor = conn.cursor()
-            cursor.execute(
-                "SELECT status FROM file_processing_log WHERE file_path = ? AND status = 'success'",
-                (file_path,)
-            )
-            result = cursor.fetchone()
-            return result is not None
+        with self._lock:
+            return file_path in self._load_processed_paths()
 
-    def get_inventory_summary(self, product: str = None, start_date: str = None,
-                             end_date: str = None) -> List[Dict]:
+    def get_processed_file_paths(self) -> FrozenSet[str]:
         """
-        查询库存汇总数据
+        获取所有已处理的文件路径（成功入库，或内容与已入库文件相同）
 
-        Args:
-            product: 产品名称（可选）
-            start_date: 开始日期（可选）
-            end_date: 结束日期（可选）
+        用于批量过滤：一次查询代替逐个调用 is_file_processed
 
         Returns:
-            查询结果列表
+            已处理文件路径集合
         """
+        with self._lock:
+            return frozenset(self._load_processed_paths())
+
+    def _load_processed_paths(self) -> Set[str]:
+        """
+        获取已处理文件路径缓存（首次调用时从数据库加载）
+
+        Returns:
+            已处理文件路径集合（内部缓存，调用方不应修改）
+        """
+        if self._processed_paths is None:
+            self.flush_logs()
+
+            with self.get_connection() as conn:
+                cursor = conn.cursor()
+                cursor.execute(_SQL_PROCESSED_PATHS)
+                self._processed_paths = {row[0] for row in cursor.fetchall()}
+
+        return self._processed_paths
+
+    def get_processed_content_hashes(self) -> Set[str]:
+        """
+        获取所有已成功入库文件的内容 SHA-1
+
+        Returns:
+            SHA-1 十六进制字符串集合
+        """
+        self.flush_logs()
+
         with self.get_connection() as conn:
             cursor = conn.cursor()
+            cursor.execute(_SQL_PROCESSED_HASHES)
+            return {row[0] for row in cursor.fetchall()}
 
-            sql = "SELECT * FROM inventory_history WHERE 1=1"
-            params = []
+    def analyze(self):
+        """
+        更新查询优化器的统计信息（批量导入后调用，便于选择合适的索引）
+        """
+        with self.get_connection() as conn:
+            conn.execute("ANALYZE")
+
+    def _iter_query(self, sql: str, params: Tuple[Any, ...]) -> Iterator[sqlite3.Row]:
+        """
+        分批读取查询结果（每批 FETCH_BATCH_SIZE 行），不一次性加载全部结果
 
-            if product:
-                sql += " AND product = ?"
-                params.append(product)
+        只读查询不开启事务，锁只在每次读取一批时持有，不跨越 yield；
+        提前停止迭代（break、close 或被回收）时关闭游标，不影响后续写入。
 
-            if start_date:
-                sql += " AND activity_date >= ?"
-                params.append(start_date)
+        Args:
+            sql: SQL 语句
+            params: 查询参数
 
-            if end_date:
-                sql += " AND activity_date <= ?"
-                params.append(end_date)
+        Yields:
+            sqlite3.Row 行对象（支持按列名访问）
+        """
+        with self._lock:
+            cursor = self._conn.execute(sql, params)
 
-            sql += " ORDER BY activity_date DESC, product, depository"
+        try:
+            while True:
+                with self._lock:
+                    rows = cursor.fetchmany(FETCH_BATCH_SIZE)
+                if not rows:
+                    break
+                yield from rows
+        finally:
+            cursor.close()
 
-            cursor.execute(sql, params)
-            columns = [desc[0] for desc in cursor.description]
+    def iter_inventory_summary(self, product: str = None, start_date: str = None,
+                               end_date: str = None) -> Iterator[sqlite3.Row]:
+        """
+        流式查询库存汇总数据（适合导出、统计等大结果集场景）
 
-            results = []
-            for row in cursor.fetchall():
-                results.append(dict(zip(columns, row)))
+        Args:
+            product: 产品名称（可选）
+            start_date: 开始日期（可选）
+            end_date: 结束日期（可选）
 
-            return results
+        Yields:
+            sqlite3.Row 行对象
+        """
+        filters = (product, start_date, end_date)
+        sql = _SQL_INVENTORY_SUMMARY[tuple(bool(value) for value in filters)]
+        params = tuple(value for value in filters if value)
+        return self._iter_query(sql, params)
 
-    def get_delivery_summary(self, product: str = None, report_type: str = None) -> List[Dict]:
+    def get_inventory_summary(self, product: str = None, start_date: str = None,
+                             end_date: str = None) -> List[Dict]:
         """
-        查询交割通知汇总数据
+        查询库存汇总数据
 
         Args:
             product: 产品名称（可选）
-            report_type: 报告类型（可选）
+            start_date: 开始日期（可选）
+            end_date: 结束日期（可选）
 
         Returns:
             查询结果列表
         """
-        with self.get_connection() as conn:
-            cursor = conn.cursor()
-
-            sql = "SELECT * FROM delivery_notices WHERE 1=1"
-            params = []
+        return [dict(row) for row in self.iter_inventory_summary(product, start_date, end_date)]
 
-            if product:
-                sql += " AND product LIKE ?"
-                params.append(f"%{product}%")
+    def iter_delivery_summary(self, product: str = None,
+                              report_type: str = None) -> Iterator[sqlite3.Row]:
+        """
+        流式查询交割通知汇总数据
 
-            if report_type:
-                sql += " AND report_type = ?"
-                params.append(report_type)
+        Args:
+            product: 产品名称（可选）
+            report_type: 报告类型（可选）
 
-            sql += " ORDER BY intent_date DESC, product"
+        Yields:
+            sqlite3.Row 行对象
+        """
+        filters = (f"%{product}%" if product else None, report_type)
+        sql = _SQL_DELIVERY_SUMMARY[tuple(bool(value) for value in filters)]
+        params = tuple(value for value in filters if value)
+        return self._iter_query(sql, params)
 
-            cursor.execute(sql, params)
-            columns = [desc[0] for desc in cursor.description]
+    def get_delivery_summary(self, product: str = None, report_type: str = None) -> List[Dict]:
+        """
+        查询交割通知汇总数据
 
-            results = []
-            for row in cursor.fetchall():
-                results.append(dict(zip(columns, row)))
+        Args:
+            product: 产品名称（可选）
+            report_type: 报告类型（可选）
 
-            return results
+        Returns:
+            查询结果列表
+        """
+        return [dict(row) for row in self.iter_delivery_summary(product, report_type)]
 
     def get_processing_stats(self) -> Dict:
         """
@@ -390,28 +672,15 @@ class DatabaseManager:
         Returns:
             统计信息字典
         """
+        self.flush_logs()
+
         with self.get_connection() as conn:
             cursor = conn.cursor()
 
-            # 总文件数
-            cursor.execute("SELECT COUNT(*) FROM file_processing_log")
-            total_files = cursor.fetchone()[0]
-
-            # 成功处理的文件数
-            cursor.execute("SELECT COUNT(*) FROM file_processing_log WHERE status = 'success'")
-            success_files = cursor.fetchone()[0]
-
-            # 失败的文件数
-            cursor.execute("SELECT COUNT(*) FROM file_processing_log WHERE status = 'failed'")
-            failed_files = cursor.fetchone()[0]
-
-            # 库存记录总数
-            cursor.execute("SELECT COUNT(*) FROM inventory_history")
-            inventory_records = cursor.fetchone()[0]
-
-            # 交割记录总数
-            cursor.execute("SELECT COUNT(*) FROM delivery_notices")
-            delivery_records = cursor.fetchone()[0]
+            # 一次查询：文件数按状态条件聚合（单次扫描），记录总数用子查询
+            cursor.execute(_SQL_PROCESSING_STATS)
+            (total_files, success_files, failed_files,
+             inventory_records, delivery_records) = cursor.fetchone()
 
             return {
                 'total_files': total_files,
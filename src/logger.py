@@ -9,9 +9,9 @@ import logging
 import sys
 from logging.handlers import RotatingFileHandler
 from pathlib import Path
+from typing import Dict
 
 from config import (
-    LOG_DIR,
     LOG_FILE,
     LOG_LEVEL,
     LOG_FORMAT,
@@ -21,6 +21,26 @@ from config import (
 )
 
 
+# 日志级别（导入时解析一次）
+_LEVEL = getattr(logging, LOG_LEVEL)
+
+# 已配置的 logger 缓存：name -> logger
+_LOGGER_CACHE: Dict[str, logging.Logger] = {}
+
+
+class _LazyRotatingFileHandler(RotatingFileHandler):
+    """
+    延迟打开的轮转日志 handler（delay=True）
+
+    首次写入日志时才创建日志目录并打开文件，
+    未产生日志的命令（如 --help）不会触碰磁盘。
+    """
+
+    def _open(self):
+        Path(self.baseFilename).parent.mkdir(parents=True, exist_ok=True)
+        return super()._open()
+
+
 def setup_logger(name: str = "CMEDownloader", log_to_console: bool = True) -> logging.Logger:
     """
     配置并返回日志记录器
@@ -32,38 +52,43 @@ def setup_logger(name: str = "CMEDownloader", log_to_console: bool = True) -> lo
     Returns:
         配置好的 logger 对象
     """
-    # 创建日志目录
-    LOG_DIR.mkdir(parents=True, exist_ok=True)
+    # 已配置过的 logger 直接返回
+    logger = _LOGGER_CACHE.get(name)
+    if logger is not None:
+        return logger
 
     # 创建 logger
     logger = logging.getLogger(name)
-    logger.setLevel(getattr(logging, LOG_LEVEL))
+    logger.setLevel(_LEVEL)
 
     # 避免重复添加 handler
     if logger.handlers:
+        _LOGGER_CACHE[name] = logger
         return logger
 
     # 创建格式化器
     formatter = logging.Formatter(LOG_FORMAT, datefmt=LOG_DATE_FORMAT)
 
-    # 文件 handler - 使用 RotatingFileHandler 自动轮转日志
-    file_handler = RotatingFileHandler(
+    # 文件 handler - 使用 RotatingFileHandler 自动轮转日志（首次写入时才创建）
+    file_handler = _LazyRotatingFileHandler(
         LOG_FILE,
         maxBytes=LOG_MAX_BYTES,
         backupCount=LOG_BACKUP_COUNT,
-        encoding='utf-8'
+        encoding='utf-8',
+        delay=True
     )
-    file_handler.setLevel(getattr(logging, LOG_LEVEL))
+    file_handler.setLevel(_LEVEL)
     file_handler.setFormatter(formatter)
     logger.addHandler(file_handler)
 
     # 控制台 handler
     if log_to_console:
         console_handler = logging.StreamHandler(sys.stdout)
-        console_handler.setLevel(getattr(logging, LOG_LEVEL))
+        console_handler.setLevel(_LEVEL)
         console_handler.setFormatter(formatter)
         logger.addHandler(console_handler)
 
+    _LOGGER_CACHE[name] = logger
     return logger
 
 
@@ -78,10 +103,10 @@ def get_logger(name: str = "CMEDownloader") -> logging.Logger:
     Returns:
         logger 对象
     """
-    logger = logging.getLogger(name)
-    if not logger.handlers:
-        return setup_logger(name)
-    return logger
+    logger = _LOGGER_CACHE.get(name)
+    if logger is not None:
+        return logger
+    return setup_logger(name)
 
 
 if __name__ == "__main__":
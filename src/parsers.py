@@ -5,15 +5,218 @@ CME 数据解析器模块
 负责解析 CSV、XLS 和 PDF 格式的 CME 报告
 """
 
+import io
+import os
 import re
+import sys
 import logging
+import functools
+from itertools import islice
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
-from typing import List, Dict, Optional, Any
+from typing import List, Dict, Optional, Any, Iterator, Union
 from datetime import datetime
 
 import pandas as pd
 import pdfplumber
 
+try:
+    import pypdfium2 as pdfium
+except ImportError:  # 可选依赖：未安装时只使用 pdfplumber
+    pdfium = None
+
+try:
+    from openpyxl import load_workbook
+except ImportError:  # 未安装 openpyxl 时由 pandas 读取（.xlsx 同样需要 openpyxl）
+    load_workbook = None
+
+from records import ColumnBuffer, INVENTORY_FIELDS, DELIVERY_FIELDS
+
+
+def _year_first(date_str: str, separator: str) -> bool:
+    """日期字符串以 4 位年份 + 分隔符开头（%Y 固定匹配 4 位数字）"""
+    return date_str[:4].isdigit() and date_str[4:5] == separator
+
+
+def _year_last(date_str: str, separator: str) -> bool:
+    """日期字符串以分隔符 + 4 位年份结尾"""
+    return date_str[-4:].isdigit() and date_str[-5:-4] == separator
+
+
+# 日期解析支持的格式（CME 报告最常见的格式在前，命中即返回）及其形状检查；
+# 形状不符的格式必然解析失败，跳过以免 strptime 抛出异常
+_DATE_FORMAT_RULES = (
+    ("%B %d, %Y", lambda s: ',' in s and s[-4:].isdigit()),    # January 13, 2024
+    ("%m/%d/%Y", lambda s: _year_last(s, '/')),                # 01/13/2024
+    ("%Y-%m-%d", lambda s: _year_first(s, '-')),               # 2024-01-13
+    ("%d-%b-%Y", lambda s: _year_last(s, '-')),                # 13-Jan-2024
+    ("%d/%m/%Y", lambda s: _year_last(s, '/')),                # 13/01/2024
+    ("%Y/%m/%d", lambda s: _year_first(s, '/')),               # 2024/01/13
+)
+
+# 元数据行中 "键: 值" 的值部分
+_COLON_VALUE_RE = re.compile(r':\s*(.+)')
+
+# 元数据行关键字（一次扫描识别所有关键字；日期关键字不区分大小写，单位区分大小写）
+_META_RE = re.compile(
+    r'(?P<activity_date>activity date)|(?P<report_date>report date)|(?P<unit>(?-i:Troy Ounce))',
+    re.IGNORECASE
+)
+
+# CONTRACT 行（调用方已确认行以 "CONTRACT:" 开头，使用 match 锚定行首）
+# "COMEX [数字]" 部分可选，兼容 "CONTRACT: JANUARY 2026 COMEX 100 GOLD FUTURES"
+# 和 "CONTRACT: JANUARY 2026 ALUMINUM FUTURES"；优先按带 COMEX 的格式匹配
+_CONTRACT_RE = re.compile(r'CONTRACT:\s*([A-Z]+)\s+(\d{4})\s+(?:COMEX\s+(?:\d+\s+)?)?([A-Z]+)\s+FUTURES')
+
+# 交割通知文件名中的报告类型关键词
+_REPORT_TYPE_RE = re.compile(r'daily|monthly|ytd|year', re.IGNORECASE)
+
+# 交割通知中的 INTENT DATE 和数字
+_INTENT_DATE_RE = re.compile(r'INTENT DATE:\s*(\d{2}/\d{2}/\d{4})')
+_DIGITS_RE = re.compile(r'\d+')
+
+# 交割通知中含关键字的整行（其余行不影响解析结果）
+_BLOCK_LINE_RE = re.compile(r'^.*(?:CONTRACT:|EXCHANGE:|TOTAL:|INTENT DATE:|MONTH TO DATE:).*$', re.MULTILINE)
+
+# CONTRACT 行之后最多向前查找的行数（含 CONTRACT 行本身）
+_CONTRACT_LOOKAHEAD_LINES = 20
+
+# 数字清洗：需要删除的字符（千分位逗号、空格、制表符、不间断空格）及表示空值的字符串
+_NUMERIC_STRIP_TABLE = str.maketrans('', '', ', \t\xa0')
+_NULL_TOKENS = frozenset(('', 'N/A', 'NA', '-', 'NULL', 'NONE', 'NAN'))
+_NUMERIC_STRIP_PATTERN = r'[,\s]'
+
+# pd.api.types.infer_dtype 结果中无需文本清洗、可直接转换为数字的类型
+_NUMERIC_INFERRED_TYPES = frozenset(('integer', 'floating', 'mixed-integer-float', 'empty'))
+
+# 库存表中需要跳过的 Depository 值（小写）：空行和汇总行
+_SKIP_DEPOSITORY = frozenset(('', 'total', 'grand total'))
+
+# 库存文件头部读取行数（元数据与表头都在这一区域内）
+_HEADER_BLOCK_ROWS = 15
+
+# 表头可能所在的行号范围，以及表头中用于识别数据表的列名
+_HEADER_ROW_RANGE = range(5, 15)
+_HEADER_KEYWORDS = ('depository', 'warehouse')
+
+
+@functools.lru_cache(maxsize=4096)
+def _parse_date_cached(date_str: str) -> Optional[str]:
+    """
+    解析日期（结果按原始字符串缓存）
+
+    同一报告中的日期字符串大量重复，缓存后重复值只需一次字典查找；
+    只对形状相符的格式调用 strptime
+
+    Args:
+        date_str: 已去除首尾空白的日期字符串
+
+    Returns:
+        YYYY-MM-DD 格式日期字符串或 None
+    """
+    # 最常见的 MM/DD/YYYY（交割通知的 INTENT DATE）直接构造日期，不经过 strptime；
+    # 日期无效时（如 13/01/2024）继续按格式列表尝试
+    if (len(date_str) == 10 and date_str[2] == '/' and date_str[5] == '/'
+            and date_str[:2].isdigit() and date_str[3:5].isdigit() and date_str[6:].isdigit()):
+        try:
+            return datetime(int(date_str[6:]), int(date_str[:2]), int(date_str[3:5])).strftime("%Y-%m-%d")
+        except ValueError:
+            pass
+
+    for fmt, matches_shape in _DATE_FORMAT_RULES:
+        if not matches_shape(date_str):
+            continue
+        try:
+            return datetime.strptime(date_str, fmt).strftime("%Y-%m-%d")
+        except ValueError:
+            continue
+
+    return None
+
+
+@functools.lru_cache(maxsize=512)
+def detect_product(filename: str) -> str:
+    """
+    从文件名检测产品类型（结果按文件名缓存）
+
+    Args:
+        filename: 文件名
+
+    Returns:
+        产品名称（Gold、Silver 或 Unknown）
+    """
+    filename_lower = filename.lower()
+
+    if 'gold' in filename_lower:
+        return 'Gold'
+    elif 'silver' in filename_lower:
+        return 'Silver'
+    else:
+        return 'Unknown'
+
+
+@functools.lru_cache(maxsize=512)
+def detect_report_type(filename: str) -> str:
+    """
+    从文件名检测交割通知的报告类型（结果按文件名缓存）
+
+    Args:
+        filename: 文件名
+
+    Returns:
+        报告类型：'Daily', 'Monthly', 或 'YTD'
+    """
+    # 一次扫描找出所有关键词，再按优先级判断
+    found = {token.lower() for token in _REPORT_TYPE_RE.findall(filename)}
+
+    if 'daily' in found:
+        return 'Daily'
+    elif 'monthly' in found:
+        return 'Monthly'
+    elif 'ytd' in found or 'year' in found:
+        return 'YTD'
+
+    return 'Daily'  # 默认
+
+
+def _open_source(file_path: Path, data: Union[bytes, pd.ExcelFile, None]):
+    """
+    返回供 pandas/openpyxl 读取的数据源
+
+    已打开的 ExcelFile 直接复用；文件内容已在内存中时每次返回新的 BytesIO
+    （读取会移动位置）；否则返回文件路径
+
+    Args:
+        file_path: 文件路径
+        data: 已打开的 ExcelFile 或已读入内存的文件内容（可选）
+
+    Returns:
+        ExcelFile、BytesIO 或文件路径
+    """
+    if isinstance(data, pd.ExcelFile):
+        return data
+    return io.BytesIO(data) if data is not None else file_path
+
+
+def _line_numbers(line: str, marker: str) -> List[str]:
+    """
+    取出汇总行（TOTAL / MONTH TO DATE）中的数字
+
+    常见格式是以标记开头、后跟空格分隔的整数（如 "TOTAL: 15 15"），直接 split
+    后检查；其他格式回退到正则，结果与 re.findall(r'\d+', line) 一致
+
+    Args:
+        line: 行文本
+        marker: 行首标记，如 'TOTAL:'
+
+    Returns:
+        数字字符串列表
+    """
+    tokens = line[len(marker):].split() if line.startswith(marker) else None
+    if tokens and all(token.isascii() and token.isdigit() for token in tokens):
+        return tokens
+    return _DIGITS_RE.findall(line)
+
 
 class BaseParser:
     """
@@ -46,28 +249,48 @@ class BaseParser:
         Returns:
             浮点数或 None
         """
-        if pd.isna(value) or value == '' or value is None:
+        if value is None:
             return None
 
-        # 如果已经是数字类型，直接返回
-        if isinstance(value, (int, float)):
+        # 如果已经是数字类型，直接返回（NaN 不等于自身；int 不可能是 NaN）
+        if isinstance(value, float):
+            return None if value != value else float(value)
+        if isinstance(value, int):
             return float(value)
 
-        # 转换为字符串并清理
-        value_str = str(value).strip()
+        # 转换为字符串，移除逗号和空白
+        value_str = str(value).translate(_NUMERIC_STRIP_TABLE).strip()
 
         # 处理特殊值
-        if value_str.upper() in ['N/A', 'NA', '-', 'NULL', 'NONE']:
+        if value_str.upper() in _NULL_TOKENS:
             return None
 
-        # 移除逗号和空格
-        value_str = value_str.replace(',', '').replace(' ', '')
-
         try:
             return float(value_str)
         except (ValueError, TypeError):
             return None
 
+    @classmethod
+    def clean_numeric_series(cls, values) -> pd.Series:
+        """
+        整列清洗数字，clean_numeric_string 的向量化版本
+
+        数值列（包括只含数字和空值的 object 列）直接转换；
+        文本列去除逗号和空白后由 pd.to_numeric 统一解析，
+        空值和无法解析的值（N/A、- 等）为 NaN
+
+        Args:
+            values: 单元格数组或 Series
+
+        Returns:
+            float64 Series
+        """
+        series = values if isinstance(values, pd.Series) else pd.Series(values)
+        if (not pd.api.types.is_numeric_dtype(series)
+                and pd.api.types.infer_dtype(series, skipna=True) not in _NUMERIC_INFERRED_TYPES):
+            series = series.astype(str).str.replace(_NUMERIC_STRIP_PATTERN, '', regex=True)
+        return pd.to_numeric(series, errors='coerce').astype(float)
+
     @staticmethod
     def parse_date_string(date_str: str) -> Optional[str]:
         """
@@ -88,26 +311,7 @@ class BaseParser:
         if pd.isna(date_str) or not date_str:
             return None
 
-        date_str = str(date_str).strip()
-
-        # 尝试多种日期格式
-        date_formats = [
-            "%B %d, %Y",      # January 13, 2024
-            "%m/%d/%Y",       # 01/13/2024
-            "%Y-%m-%d",       # 2024-01-13
-            "%d-%b-%Y",       # 13-Jan-2024
-            "%d/%m/%Y",       # 13/01/2024
-            "%Y/%m/%d",       # 2024/01/13
-        ]
-
-        for fmt in date_formats:
-            try:
-                parsed_date = datetime.strptime(date_str, fmt)
-                return parsed_date.strftime("%Y-%m-%d")
-            except ValueError:
-                continue
-
-        return None
+        return _parse_date_cached(str(date_str).strip())
 
 
 class InventoryParser(BaseParser):
@@ -117,7 +321,7 @@ class InventoryParser(BaseParser):
     处理 Gold Stocks 和 Silver Stocks 文件
     """
 
-    def parse_file(self, file_path: Path) -> List[Dict[str, Any]]:
+    def parse_file(self, file_path: Path) -> ColumnBuffer:
         """
         解析库存报告文件
 
@@ -125,27 +329,37 @@ class InventoryParser(BaseParser):
             file_path: 文件路径
 
         Returns:
-            解析后的记录列表
+            解析后的记录（列式缓冲区，可按记录迭代）；失败返回空缓冲区
         """
         self.logger.info(f"开始解析库存文件: {file_path.name}")
+        workbook = None
 
         try:
             # 判断产品类型
             product = self._detect_product(file_path.name)
 
-            # 读取文件并提取元数据
-            metadata = self._extract_metadata(file_path)
+            # 文件内容只读取一次，后续各次解析都使用内存中的数据
+            data = file_path.read_bytes()
+
+            # Excel 工作簿只打开一次，文件头部和数据表都从同一个 ExcelFile 读取
+            if file_path.suffix.lower() in ['.xls', '.xlsx']:
+                workbook = pd.ExcelFile(io.BytesIO(data))
+                data = workbook
+
+            # 读取文件头部并提取元数据（头部同时用于定位表头）
+            df_header = self._read_header_block(file_path, data)
+            metadata = self._extract_metadata(file_path, df_header) if df_header is not None else None
 
             if not metadata or not metadata.get('activity_date'):
                 self.logger.error(f"无法提取 Activity Date: {file_path.name}")
-                return []
+                return ColumnBuffer(INVENTORY_FIELDS)
 
             # 读取数据表格
-            df = self._read_data_table(file_path)
+            df = self._read_data_table(file_path, df_header, data)
 
             if df is None or df.empty:
                 self.logger.warning(f"文件中没有有效数据: {file_path.name}")
-                return []
+                return ColumnBuffer(INVENTORY_FIELDS)
 
             # 转换为记录列表
             records = self._convert_to_records(df, product, metadata)
@@ -155,7 +369,11 @@ class InventoryParser(BaseParser):
 
         except Exception as e:
             self.logger.error(f"解析文件失败 {file_path.name}: {e}", exc_info=True)
-            return []
+            return ColumnBuffer(INVENTORY_FIELDS)
+
+        finally:
+            if workbook is not None:
+                workbook.close()
 
     def _detect_product(self, filename: str) -> str:
         """
@@ -167,16 +385,62 @@ class InventoryParser(BaseParser):
         Returns:
             产品名称（Gold 或 Silver）
         """
-        filename_lower = filename.lower()
+        return detect_product(filename)
+
+    def _read_header_block(self, file_path: Path, data: Union[bytes, pd.ExcelFile, None] = None) -> Optional[pd.DataFrame]:
+        """
+        读取文件前 15 行（不带表头）
 
-        if 'gold' in filename_lower:
-            return 'Gold'
-        elif 'silver' in filename_lower:
-            return 'Silver'
-        else:
-            return 'Unknown'
+        Args:
+            file_path: 文件路径
+            data: 已打开的 ExcelFile 或已读入内存的文件内容（可选，未提供时从磁盘读取）
 
-    def _extract_metadata(self, file_path: Path) -> Optional[Dict[str, Any]]:
+        Returns:
+            头部 DataFrame，读取失败返回 None
+        """
+        try:
+            source = _open_source(file_path, data)
+            suffix = file_path.suffix.lower()
+            if suffix == '.xlsx' and load_workbook is not None:
+                return self._read_xlsx_head(source, _HEADER_BLOCK_ROWS)
+            if suffix in ['.xls', '.xlsx']:
+                return pd.read_excel(source, header=None, nrows=_HEADER_BLOCK_ROWS)
+            return pd.read_csv(source, header=None, nrows=_HEADER_BLOCK_ROWS)
+
+        except Exception as e:
+            self.logger.error(f"读取文件头部失败: {e}", exc_info=True)
+            return None
+
+    @staticmethod
+    def _read_xlsx_head(source, nrows: int) -> pd.DataFrame:
+        """
+        以只读模式读取 xlsx 第一个工作表的前 nrows 行
+
+        pd.read_excel 会先解析整个工作表，只读模式按行流式读取，读够即停。
+        传入已打开的 ExcelFile（openpyxl 引擎）时直接复用其只读工作簿
+
+        Args:
+            source: xlsx 文件路径、文件对象或 ExcelFile
+            nrows: 读取行数
+
+        Returns:
+            不带表头的 DataFrame
+        """
+        if isinstance(source, pd.ExcelFile):
+            if source.engine != 'openpyxl':
+                return pd.read_excel(source, header=None, nrows=nrows)
+            worksheet = source.book.worksheets[0]
+            return pd.DataFrame(list(worksheet.iter_rows(max_row=nrows, values_only=True)))
+
+        workbook = load_workbook(source, read_only=True, data_only=True)
+        try:
+            rows = list(islice(workbook.worksheets[0].iter_rows(values_only=True), nrows))
+        finally:
+            workbook.close()
+        return pd.DataFrame(rows)
+
+    def _extract_metadata(self, file_path: Path,
+                          df_header: Optional[pd.DataFrame] = None) -> Optional[Dict[str, Any]]:
         """
         从文件头部提取元数据
 
@@ -184,48 +448,47 @@ class InventoryParser(BaseParser):
 
         Args:
             file_path: 文件路径
+            df_header: 已读取的文件头部（可选，未提供时读取文件前 15 行）
 
         Returns:
             元数据字典
         """
         try:
-            # 读取前 15 行（元数据通常在前 10 行）
-            if file_path.suffix.lower() in ['.xls', '.xlsx']:
-                df_header = pd.read_excel(file_path, header=None, nrows=15)
-            else:
-                df_header = pd.read_csv(file_path, header=None, nrows=15)
+            if df_header is None:
+                df_header = self._read_header_block(file_path)
+                if df_header is None:
+                    return None
+
+            # 每行非空单元格拼接为一段文本（整块只做一次向量化转换）
+            row_texts = df_header.astype(str).where(df_header.notna(), '').agg(' '.join, axis=1).tolist()
 
             metadata = {}
+            unit_found = False
 
-            # 遍历每一行，查找关键字
-            for idx, row in df_header.iterrows():
-                # 转换为字符串并合并所有列
-                row_text = ' '.join([str(cell) for cell in row if pd.notna(cell)])
-
-                # 提取 Activity Date（优先）
-                if 'Activity Date' in row_text or 'activity date' in row_text.lower():
-                    # 查找日期部分
-                    date_match = re.search(r':\s*(.+)', row_text)
-                    if date_match:
-                        date_str = date_match.group(1).strip()
-                        parsed_date = self.parse_date_string(date_str)
-                        if parsed_date:
-                            metadata['activity_date'] = parsed_date
-                            self.logger.info(f"提取到 Activity Date: {parsed_date}")
-
-                # 提取 Report Date（备用）
-                if 'Report Date' in row_text or 'report date' in row_text.lower():
-                    date_match = re.search(r':\s*(.+)', row_text)
-                    if date_match:
-                        date_str = date_match.group(1).strip()
-                        parsed_date = self.parse_date_string(date_str)
+            # 每行只用一个组合正则扫描一次关键字；Activity Date（优先）和
+            # Report Date（备用）多行匹配时以最后一个有效日期为准
+            for row_text in row_texts:
+                keywords = {match.lastgroup for match in _META_RE.finditer(row_text)}
+                if not keywords:
+                    continue
+                if 'unit' in keywords:
+                    unit_found = True
+
+                value_match = _COLON_VALUE_RE.search(row_text)
+                if value_match is None:
+                    continue
+                for key in ('activity_date', 'report_date'):
+                    if key in keywords:
+                        parsed_date = self.parse_date_string(value_match.group(1).strip())
                         if parsed_date:
-                            metadata['report_date'] = parsed_date
+                            metadata[key] = parsed_date
+
+            if 'activity_date' in metadata:
+                self.logger.info(f"提取到 Activity Date: {metadata['activity_date']}")
 
-                # 提取单位
-                if 'unit' in row_text.lower() or 'troy ounce' in row_text.lower():
-                    if 'Troy Ounce' in row_text:
-                        metadata['unit'] = 'Troy Ounces'
+            # 提取单位
+            if unit_found:
+                metadata['unit'] = 'Troy Ounces'
 
             return metadata if metadata else None
 
@@ -233,37 +496,39 @@ class InventoryParser(BaseParser):
             self.logger.error(f"提取元数据失败: {e}", exc_info=True)
             return None
 
-    def _read_data_table(self, file_path: Path) -> Optional[pd.DataFrame]:
+    def _read_data_table(self, file_path: Path, df_header: Optional[pd.DataFrame] = None,
+                         data: Union[bytes, pd.ExcelFile, None] = None) -> Optional[pd.DataFrame]:
         """
         读取数据表格（跳过元数据行）
 
+        优先根据文件头部定位表头行，只读取一次文件；
+        定位失败时回退为逐个尝试 skiprows
+
         Args:
             file_path: 文件路径
+            df_header: 已读取的文件头部（可选）
+            data: 已打开的 ExcelFile 或已读入内存的文件内容（可选，未提供时从磁盘读取）
 
         Returns:
             DataFrame
         """
         try:
-            # 尝试不同的 skiprows 值，找到表头
-            for skip in range(5, 15):
-                try:
-                    if file_path.suffix.lower() in ['.xls', '.xlsx']:
-                        df = pd.read_excel(file_path, skiprows=skip)
-                    else:
-                        df = pd.read_csv(file_path, skiprows=skip)
-
-                    # 检查是否找到正确的表头
-                    # 库存表通常包含 Depository, Registered, Eligible, Total 等列
-                    columns_lower = [str(col).lower() for col in df.columns]
+            header_row = self._find_header_row(df_header) if df_header is not None else None
+            read_options = {}
+            if header_row is not None:
+                if file_path.suffix.lower() not in ['.xls', '.xlsx']:
+                    read_options = self._csv_read_options(df_header.iloc[header_row])
+                df = self._read_table_at(file_path, header_row, data, **read_options)
+                if df is not None:
+                    return df
 
-                    if 'depository' in columns_lower or 'warehouse' in columns_lower:
-                        self.logger.info(f"找到数据表（skiprows={skip}）")
-                        # 清理列名
-                        df.columns = df.columns.str.strip()
-                        return df
-
-                except Exception:
+            # 尝试不同的 skiprows 值，找到表头
+            for skip in _HEADER_ROW_RANGE:
+                if skip == header_row and not read_options:
                     continue
+                df = self._read_table_at(file_path, skip, data)
+                if df is not None:
+                    return df
 
             self.logger.warning("未找到有效的数据表")
             return None
@@ -272,10 +537,94 @@ class InventoryParser(BaseParser):
             self.logger.error(f"读取数据表失败: {e}", exc_info=True)
             return None
 
+    @staticmethod
+    def _find_header_row(df_header: pd.DataFrame) -> Optional[int]:
+        """
+        在文件头部中查找表头所在行
+
+        Args:
+            df_header: 文件头部（不带表头读取）
+
+        Returns:
+            表头行号，未找到返回 None
+        """
+        is_header = df_header.astype(str).apply(lambda col: col.str.lower()).isin(_HEADER_KEYWORDS).any(axis=1)
+        for idx in df_header.index[is_header.to_numpy()]:
+            if idx in _HEADER_ROW_RANGE:
+                return int(idx)
+        return None
+
+    @staticmethod
+    def _csv_read_options(header_cells: pd.Series) -> Dict[str, Any]:
+        """
+        根据表头单元格生成 CSV 读取参数
+
+        数字列（Registered、Eligible、Total）直接按 float64 读取，
+        千分位逗号和空值标记由 C 解析器处理，省去类型推断和文本清洗
+
+        Args:
+            header_cells: 表头行的单元格
+
+        Returns:
+            传给 pd.read_csv 的关键字参数
+        """
+        numeric_columns = []
+        for cell in header_cells:
+            if not isinstance(cell, str):
+                continue
+            cell_lower = cell.lower().strip()
+            if 'depository' in cell_lower or 'warehouse' in cell_lower:
+                continue
+            if any(keyword in cell_lower for keyword in ('registered', 'eligible', 'total')):
+                numeric_columns.append(cell)
+
+        return {
+            'engine': 'c',
+            'thousands': ',',
+            'dtype': {column: 'float64' for column in numeric_columns},
+            'na_values': {column: list(_NULL_TOKENS) for column in numeric_columns},
+        }
+
+    def _read_table_at(self, file_path: Path, skip: int, data: Union[bytes, pd.ExcelFile, None] = None,
+                       **read_options) -> Optional[pd.DataFrame]:
+        """
+        跳过指定行数读取数据表，并检查表头是否有效
+
+        Args:
+            file_path: 文件路径
+            skip: 跳过的行数
+            data: 已打开的 ExcelFile 或已读入内存的文件内容（可选）
+            **read_options: 额外的 pd.read_csv 参数（仅 CSV 使用）
+
+        Returns:
+            DataFrame，表头无效或读取失败返回 None
+        """
+        try:
+            source = _open_source(file_path, data)
+            if file_path.suffix.lower() in ['.xls', '.xlsx']:
+                df = pd.read_excel(source, skiprows=skip)
+            else:
+                df = pd.read_csv(source, skiprows=skip, **read_options)
+
+            # 检查是否找到正确的表头
+            # 库存表通常包含 Depository, Registered, Eligible, Total 等列
+            columns_lower = [str(col).lower() for col in df.columns]
+
+            if not any(keyword in columns_lower for keyword in _HEADER_KEYWORDS):
+                return None
+
+            self.logger.info(f"找到数据表（skiprows={skip}）")
+            # 清理列名
+            df.columns = df.columns.str.strip()
+            return df
+
+        except Exception:
+            return None
+
     def _convert_to_records(self, df: pd.DataFrame, product: str,
-                           metadata: Dict[str, Any]) -> List[Dict[str, Any]]:
+                           metadata: Dict[str, Any]) -> ColumnBuffer:
         """
-        将 DataFrame 转换为记录列表
+        将 DataFrame 转换为列式记录缓冲区
 
         Args:
             df: DataFrame
@@ -283,10 +632,8 @@ class InventoryParser(BaseParser):
             metadata: 元数据
 
         Returns:
-            记录列表
+            列式记录缓冲区（字段顺序见 INVENTORY_FIELDS）
         """
-        records = []
-
         # 查找列名（不区分大小写）
         columns_map = {}
         for col in df.columns:
@@ -302,41 +649,38 @@ class InventoryParser(BaseParser):
 
         if not columns_map.get('depository'):
             self.logger.error("未找到 Depository 列")
-            return []
-
-        # 遍历每一行
-        for idx, row in df.iterrows():
-            depository = str(row[columns_map['depository']]).strip()
-
-            # 跳过空行或汇总行
-            if pd.isna(row[columns_map['depository']]) or \
-               depository in ['', 'Total', 'TOTAL', 'Grand Total']:
-                continue
-
-            # 跳过表头重复行
-            if 'depository' in depository.lower():
-                continue
-
-            record = {
-                'activity_date': metadata.get('activity_date'),
-                'product': product,
-                'depository': depository,
-                'registered': self.clean_numeric_string(
-                    row.get(columns_map.get('registered'))
-                ) if columns_map.get('registered') else None,
-                'eligible': self.clean_numeric_string(
-                    row.get(columns_map.get('eligible'))
-                ) if columns_map.get('eligible') else None,
-                'total': self.clean_numeric_string(
-                    row.get(columns_map.get('total'))
-                ) if columns_map.get('total') else None,
-                'unit': metadata.get('unit', 'Troy Ounces'),
-                'report_date': metadata.get('report_date')
-            }
-
-            records.append(record)
-
-        return records
+            return ColumnBuffer(INVENTORY_FIELDS)
+
+        # 整列向量化处理，不逐行遍历
+        depository_raw = df[columns_map['depository']]
+        depository = depository_raw.astype(str).str.strip()
+
+        # 跳过空行、汇总行和重复的表头行（只做一次小写转换）
+        depository_lower = depository.str.lower()
+        mask = (
+            depository_raw.notna().to_numpy()
+            & ~depository_lower.isin(_SKIP_DEPOSITORY).to_numpy()
+            & ~depository_lower.str.contains('depository', regex=False, na=False).to_numpy()
+        )
+        count = int(mask.sum())
+
+        def numeric_column(key: str) -> List[Optional[float]]:
+            column = columns_map.get(key)
+            if not column:
+                return [None] * count
+            numeric = self.clean_numeric_series(df[column].to_numpy()[mask])
+            return numeric.astype(object).where(numeric.notna(), None).tolist()
+
+        return ColumnBuffer.from_columns({
+            'activity_date': [metadata.get('activity_date')] * count,
+            'product': [product] * count,
+            'depository': depository.to_numpy()[mask].tolist(),
+            'registered': numeric_column('registered'),
+            'eligible': numeric_column('eligible'),
+            'total': numeric_column('total'),
+            'unit': [metadata.get('unit', 'Troy Ounces')] * count,
+            'report_date': [metadata.get('report_date')] * count
+        })
 
 
 class DeliveryNoticeParser(BaseParser):
@@ -346,7 +690,18 @@ class DeliveryNoticeParser(BaseParser):
     处理 Metal Delivery Notices (Daily, Monthly, YTD)
     """
 
-    def parse_file(self, file_path: Path, report_type: str = 'Daily') -> List[Dict[str, Any]]:
+    def __init__(self, logger: Optional[logging.Logger] = None, page_workers: int = 1):
+        """
+        初始化解析器
+
+        Args:
+            logger: 日志记录器
+            page_workers: 并行解析页面的进程数（1 表示串行处理，0 表示按 CPU 核数自动选择）
+        """
+        super().__init__(logger)
+        self.page_workers = page_workers
+
+    def parse_file(self, file_path: Path, report_type: str = 'Daily') -> ColumnBuffer:
         """
         解析交割通知 PDF
 
@@ -355,32 +710,186 @@ class DeliveryNoticeParser(BaseParser):
             report_type: 报告类型（Daily, Monthly, YTD）
 
         Returns:
-            解析后的记录列表
+            解析后的记录（列式缓冲区，可按记录迭代）；失败返回空缓冲区
         """
-        self.logger.info(f"开始解析交割通知: {file_path.name}")
-
         try:
-            with pdfplumber.open(file_path) as pdf:
-                all_records = []
+            # 各页结果按列合并，不逐条转换为字典
+            all_records = ColumnBuffer(DELIVERY_FIELDS)
+            for page_records in self._iter_page_buffers(file_path, report_type):
+                all_records.extend(page_records)
+
+            self.logger.info(f"成功解析 {len(all_records)} 条记录")
+            return all_records
+
+        except Exception as e:
+            self.logger.error(f"解析 PDF 失败 {file_path.name}: {e}", exc_info=True)
+            return ColumnBuffer(DELIVERY_FIELDS)
+
+    def iter_records(self, file_path: Path, report_type: str = 'Daily') -> Iterator[Dict[str, Any]]:
+        """
+        逐页解析交割通知 PDF，按顺序逐条产出记录
+
+        与 parse_file 不同，解析出错时直接抛出异常
+
+        Args:
+            file_path: PDF 文件路径
+            report_type: 报告类型（Daily, Monthly, YTD）
+
+        Yields:
+            交割记录字典
+        """
+        for page_records in self._iter_page_buffers(file_path, report_type):
+            yield from page_records
+
+    def _iter_page_buffers(self, file_path: Path, report_type: str) -> Iterator[ColumnBuffer]:
+        """
+        逐页解析交割通知 PDF，按页码顺序产出每页的记录缓冲区
+
+        解析出错时直接抛出异常
+
+        Args:
+            file_path: PDF 文件路径
+            report_type: 报告类型
+
+        Yields:
+            每页记录（列式缓冲区）
+        """
+        self.logger.info(f"开始解析交割通知: {file_path.name}")
 
+        # 优先使用 pypdfium2 提取文本（比 pdfplumber 快得多），未解析到记录时回退
+        if pdfium is not None:
+            page_texts = self._extract_texts_with_pdfium(file_path)
+            if page_texts is not None:
+                found = False
+                for page_num, text in enumerate(page_texts, 1):
+                    self.logger.info(f"处理第 {page_num}/{len(page_texts)} 页")
+                    page_records = self._parse_page_text(text, file_path.name, report_type)
+                    if page_records:
+                        found = True
+                        yield page_records
+                if found:
+                    return
+            self.logger.info("pypdfium2 未解析到记录，改用 pdfplumber")
+
+        with pdfplumber.open(file_path) as pdf:
+            page_count = len(pdf.pages)
+            workers = self._page_worker_count(page_count)
+
+            if workers <= 1:
                 # 遍历每一页
                 for page_num, page in enumerate(pdf.pages, 1):
-                    self.logger.info(f"处理第 {page_num}/{len(pdf.pages)} 页")
+                    self.logger.info(f"处理第 {page_num}/{page_count} 页")
 
-                    # 提取页面文本和表格
-                    records = self._parse_page(page, file_path.name, report_type)
-                    all_records.extend(records)
+                    yield self._parse_page(page, file_path.name, report_type)
+                return
 
-                self.logger.info(f"成功解析 {len(all_records)} 条记录")
-                return all_records
+        yield from self._iter_pages_parallel(file_path, page_count, workers, report_type)
 
+    def _page_worker_count(self, page_count: int) -> int:
+        """
+        计算解析页面实际使用的进程数
+
+        Args:
+            page_count: 总页数
+
+        Returns:
+            进程数（不超过页数；page_workers 为 0 时取 CPU 核数）
+        """
+        workers = self.page_workers if self.page_workers > 0 else (os.cpu_count() or 1)
+        return min(workers, page_count)
+
+    def _extract_texts_with_pdfium(self, file_path: Path) -> Optional[List[str]]:
+        """
+        使用 pypdfium2 提取每页文本
+
+        Args:
+            file_path: PDF 文件路径
+
+        Returns:
+            每页文本列表；打开或提取失败时返回 None（由调用方回退到 pdfplumber）
+        """
+        try:
+            pdf = pdfium.PdfDocument(str(file_path))
         except Exception as e:
-            self.logger.error(f"解析 PDF 失败 {file_path.name}: {e}", exc_info=True)
-            return []
+            self.logger.warning(f"pypdfium2 打开 PDF 失败: {e}")
+            return None
 
-    def _parse_page(self, page, source_file: str, report_type: str) -> List[Dict[str, Any]]:
+        try:
+            page_texts = []
+            for page_index in range(len(pdf)):
+                page = pdf[page_index]
+                text_page = page.get_textpage()
+                try:
+                    text = text_page.get_text_range()
+                finally:
+                    text_page.close()
+                    page.close()
+
+                # pdfium 使用 \r\n 换行
+                page_texts.append(text.replace('\r\n', '\n'))
+            return page_texts
+
+        except Exception as e:
+            self.logger.warning(f"pypdfium2 提取文本失败: {e}")
+            return None
+
+        finally:
+            pdf.close()
+
+    def _iter_pages_parallel(self, file_path: Path, page_count: int, workers: int,
+                             report_type: str) -> Iterator[ColumnBuffer]:
+        """
+        使用进程池并行解析各页，按页码顺序产出记录
+
+        每个工作进程自行打开 PDF，只处理分配到的页面
+
+        Args:
+            file_path: PDF 文件路径
+            page_count: 总页数
+            workers: 进程数
+            report_type: 报告类型
+
+        Yields:
+            每页记录（列式缓冲区）
+        """
+        self.logger.info(f"使用 {workers} 个进程并行解析 {page_count} 页")
+
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            page_results = executor.map(
+                _parse_page_in_worker,
+                [str(file_path)] * page_count,
+                range(page_count),
+                [report_type] * page_count
+            )
+            yield from page_results
+
+    def _parse_page(self, page, source_file: str, report_type: str) -> ColumnBuffer:
         """
-        解析 PDF 单页
+        解析 PDF 单页（pdfplumber Page）
+
+        Args:
+            page: pdfplumber Page 对象
+            source_file: 源文件名
+            report_type: 报告类型
+
+        Returns:
+            该页记录（列式缓冲区，可按记录迭代）；失败返回空缓冲区
+        """
+        try:
+            # 提取页面文本（只遍历一次字符流，不提取表格，不做版面还原）
+            text = page.extract_text(layout=False)
+        except Exception as e:
+            self.logger.error(f"解析页面失败: {e}", exc_info=True)
+            return ColumnBuffer(DELIVERY_FIELDS)
+        finally:
+            # 释放该页缓存的字符/对象列表，避免多页 PDF 的内存随页数累积
+            page.flush_cache()
+
+        return self._parse_page_text(text, source_file, report_type)
+
+    def _parse_page_text(self, text: str, source_file: str, report_type: str) -> ColumnBuffer:
+        """
+        解析单页文本
 
         实际PDF结构：
         1. CONTRACT: JANUARY 2026 ALUMINUM FUTURES
@@ -394,29 +903,43 @@ class DeliveryNoticeParser(BaseParser):
         - 从文本提取 TOTAL 和 MONTH TO DATE 汇总数据
 
         Args:
-            page: pdfplumber Page 对象
+            text: 页面文本
             source_file: 源文件名
             report_type: 报告类型
 
         Returns:
-            记录列表
+            该页记录（列式缓冲区）
         """
-        records = []
+        records = ColumnBuffer(DELIVERY_FIELDS)
 
-        try:
-            # 提取页面文本
-            text = page.extract_text()
-
-            if not text:
-                return []
+        # 没有 CONTRACT 行的页面（封面、说明页等）不会产生记录，直接跳过
+        if not text or 'CONTRACT:' not in text:
+            return records
 
-            # 按行分割文本
-            lines = text.split('\n')
+        try:
+            # 当前合约块：合约信息、CONTRACT 所在行号和已提取的字段
+            block = None
+            line_no = 0
+            last_pos = 0
+
+            # 只遍历含关键字的行，公司明细等其余行由正则直接跳过
+            for match in _BLOCK_LINE_RE.finditer(text):
+                line_no += text.count('\n', last_pos, match.start())
+                last_pos = match.start()
+                line = match.group(0).strip()
+
+                if block is not None:
+                    # 向前查找相关信息（最多查找到 CONTRACT 后第 19 行）
+                    if line_no - block['line_no'] >= _CONTRACT_LOOKAHEAD_LINES:
+                        self._finish_block(block, records, source_file, report_type)
+                        block = None
+                    else:
+                        self._update_block(block, line)
 
-            # 解析每个合约块
-            i = 0
-            while i < len(lines):
-                line = lines[i].strip()
+                        # 如果遇到下一个 CONTRACT，停止查找
+                        if line.startswith('CONTRACT:') or line.startswith('EXCHANGE:'):
+                            self._finish_block(block, records, source_file, report_type)
+                            block = None
 
                 # 查找 CONTRACT 行
                 if line.startswith('CONTRACT:'):
@@ -424,66 +947,82 @@ class DeliveryNoticeParser(BaseParser):
                     contract_info = self._extract_contract_from_line(line)
 
                     if contract_info:
-                        # 查找 INTENT DATE（通常在 CONTRACT 后面几行）
-                        intent_date = None
-                        daily_issued = None
-                        daily_stopped = None
-                        cumulative = None
-
-                        # 向前查找相关信息（最多查找20行）
-                        for j in range(i + 1, min(i + 20, len(lines))):
-                            next_line = lines[j].strip()
-
-                            # 提取 INTENT DATE
-                            if 'INTENT DATE:' in next_line:
-                                date_match = re.search(r'INTENT DATE:\s*(\d{2}/\d{2}/\d{4})', next_line)
-                                if date_match:
-                                    intent_date = self.parse_date_string(date_match.group(1))
-
-                            # 提取 TOTAL（Daily数据）
-                            if next_line.startswith('TOTAL:'):
-                                # 格式: "TOTAL: 15 15" 或 "TOTAL: 15"
-                                numbers = re.findall(r'\d+', next_line)
-                                if len(numbers) >= 2:
-                                    daily_issued = int(numbers[0])
-                                    daily_stopped = int(numbers[1])
-                                elif len(numbers) == 1:
-                                    daily_stopped = int(numbers[0])
-
-                            # 提取 MONTH TO DATE（Cumulative）
-                            if 'MONTH TO DATE:' in next_line:
-                                # 格式: "MONTH TO DATE: 134"
-                                numbers = re.findall(r'\d+', next_line)
-                                if numbers:
-                                    cumulative = int(numbers[-1])  # 取最后一个数字
-
-                            # 如果遇到下一个 CONTRACT，停止查找
-                            if next_line.startswith('CONTRACT:') or next_line.startswith('EXCHANGE:'):
-                                break
-
-                        # 如果找到了有效数据，创建记录
-                        if intent_date and (daily_stopped is not None or cumulative is not None):
-                            record = {
-                                'intent_date': intent_date,
-                                'product': contract_info['product'],
-                                'contract_month': contract_info['contract_month'],
-                                'daily_total': daily_stopped,  # 使用 STOPPED 作为 daily_total
-                                'cumulative': cumulative,
-                                'report_type': report_type,
-                                'source_file': source_file
-                            }
-
-                            records.append(record)
-                            self.logger.info(f"提取记录: {contract_info['product']} {contract_info['contract_month']}, "
-                                           f"Intent: {intent_date}, Daily: {daily_stopped}, Cumulative: {cumulative}")
-
-                i += 1
+                        block = {
+                            'contract_info': contract_info,
+                            'line_no': line_no,
+                            'intent_date': None,
+                            'daily_stopped': None,
+                            'cumulative': None
+                        }
+
+            if block is not None:
+                self._finish_block(block, records, source_file, report_type)
 
         except Exception as e:
             self.logger.error(f"解析页面失败: {e}", exc_info=True)
 
         return records
 
+    def _update_block(self, block: Dict[str, Any], line: str):
+        """
+        用合约块中的一行更新 INTENT DATE、TOTAL 和 MONTH TO DATE
+
+        Args:
+            block: 当前合约块
+            line: 已去除首尾空白的行文本
+        """
+        # 提取 INTENT DATE
+        if 'INTENT DATE:' in line:
+            date_match = _INTENT_DATE_RE.search(line)
+            if date_match:
+                block['intent_date'] = self.parse_date_string(date_match.group(1))
+
+        # 提取 TOTAL（Daily数据）
+        if line.startswith('TOTAL:'):
+            # 格式: "TOTAL: 15 15"（issued, stopped）或 "TOTAL: 15"
+            numbers = _line_numbers(line, 'TOTAL:')
+            if len(numbers) >= 2:
+                block['daily_stopped'] = int(numbers[1])
+            elif len(numbers) == 1:
+                block['daily_stopped'] = int(numbers[0])
+
+        # 提取 MONTH TO DATE（Cumulative）
+        if 'MONTH TO DATE:' in line:
+            # 格式: "MONTH TO DATE: 134"
+            numbers = _line_numbers(line, 'MONTH TO DATE:')
+            if numbers:
+                block['cumulative'] = int(numbers[-1])  # 取最后一个数字
+
+    def _finish_block(self, block: Dict[str, Any], records: ColumnBuffer,
+                      source_file: str, report_type: str):
+        """
+        合约块结束：找到有效数据时生成记录
+
+        Args:
+            block: 合约块
+            records: 记录缓冲区（有效记录追加到末尾）
+            source_file: 源文件名
+            report_type: 报告类型
+        """
+        contract_info = block['contract_info']
+        intent_date = block['intent_date']
+        daily_stopped = block['daily_stopped']
+        cumulative = block['cumulative']
+
+        if intent_date and (daily_stopped is not None or cumulative is not None):
+            # 按 DELIVERY_FIELDS 顺序追加；使用 STOPPED 作为 daily_total
+            records.append(
+                intent_date,
+                contract_info['product'],
+                contract_info['contract_month'],
+                daily_stopped,
+                cumulative,
+                report_type,
+                source_file
+            )
+            self.logger.info(f"提取记录: {contract_info['product']} {contract_info['contract_month']}, "
+                           f"Intent: {intent_date}, Daily: {daily_stopped}, Cumulative: {cumulative}")
+
     def _extract_contract_from_line(self, line: str) -> Optional[Dict[str, str]]:
         """
         从 CONTRACT 行提取合约信息
@@ -505,64 +1044,53 @@ class DeliveryNoticeParser(BaseParser):
         # 2. 匹配年份（2026）
         # 3. 可选的 COMEX 和数字
         # 4. 匹配产品名（ALUMINUM, GOLD, COPPER, SILVER等）
-
-        # 先尝试匹配带 COMEX 的格式
-        pattern1 = r'CONTRACT:\s*([A-Z]+)\s+(\d{4})\s+COMEX\s+(?:\d+\s+)?([A-Z]+)\s+FUTURES'
-        match = re.search(pattern1, line)
+        match = _CONTRACT_RE.match(line)
 
         if match:
             month = match.group(1)
             year = match.group(2)
             product = match.group(3)
 
+            # 合约月份和产品只有少数几种取值，驻留后各记录共享同一字符串对象
             return {
-                'contract_month': f"{month} {year}",
-                'product': product.title(),
+                'contract_month': sys.intern(f"{month} {year}"),
+                'product': sys.intern(product.title()),
                 'full_text': line
             }
 
-        # 再尝试匹配不带 COMEX 的格式
-        pattern2 = r'CONTRACT:\s*([A-Z]+)\s+(\d{4})\s+([A-Z]+)\s+FUTURES'
-        match = re.search(pattern2, line)
+        self.logger.warning(f"无法解析 CONTRACT 行: {line}")
+        return None
 
-        if match:
-            month = match.group(1)
-            year = match.group(2)
-            product = match.group(3)
 
-            return {
-                'contract_month': f"{month} {year}",
-                'product': product.title(),
-                'full_text': line
-            }
+# 子进程内的交割通知解析器实例（每个工作进程只创建一次）
+_worker_delivery_parser = None
 
-        self.logger.warning(f"无法解析 CONTRACT 行: {line}")
-        return None
 
-    def _parse_table(self, table: List[List[str]], contract_info: Dict[str, str],
-                    source_file: str, report_type: str) -> List[Dict[str, Any]]:
-        """
-        解析表格数据（已弃用，保留用于兼容性）
+def _parse_page_in_worker(file_path_str: str, page_index: int,
+                          report_type: str) -> ColumnBuffer:
+    """
+    进程池工作函数：在子进程中解析 PDF 的单个页面
 
-        注：当前实现直接从文本提取汇总数据，不再使用表格解析
+    Args:
+        file_path_str: PDF 文件路径字符串
+        page_index: 页面索引（从 0 开始）
+        report_type: 报告类型
 
-        Args:
-            table: 表格数据（二维列表）
-            contract_info: 合约信息
-            source_file: 源文件名
-            report_type: 报告类型
+    Returns:
+        该页的记录（列式缓冲区）
+    """
+    global _worker_delivery_parser
 
-        Returns:
-            空列表（不再使用表格解析）
-        """
-        # 新的解析逻辑直接从文本提取汇总数据
-        # 此方法保留仅为向后兼容
-        return []
+    if _worker_delivery_parser is None:
+        _worker_delivery_parser = DeliveryNoticeParser()
+
+    file_path = Path(file_path_str)
+    with pdfplumber.open(file_path) as pdf:
+        return _worker_delivery_parser._parse_page(pdf.pages[page_index], file_path.name, report_type)
 
 
 if __name__ == "__main__":
-    # 测试代码
-    import sys
+    # 测试代码（仅直接运行时导入 logger）
     sys.path.insert(0, str(Path(__file__).parent.parent))
 
     from src.logger import setup_logger
@@ -0,0 +1,140 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+记录缓冲模块
+解析器与数据库之间的列式（SoA）数据暂存结构
+"""
+
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple, Union
+
+
+# 库存记录字段（顺序与 inventory_history 插入语句一致）
+INVENTORY_FIELDS = (
+    'activity_date',
+    'product',
+    'depository',
+    'registered',
+    'eligible',
+    'total',
+    'unit',
+    'report_date'
+)
+
+# 交割通知记录字段（顺序与 delivery_notices 插入语句一致）
+DELIVERY_FIELDS = (
+    'intent_date',
+    'product',
+    'contract_month',
+    'daily_total',
+    'cumulative',
+    'report_type',
+    'source_file'
+)
+
+
+class ColumnBuffer:
+    """
+    列式记录缓冲区
+
+    每个字段保存为一列，而不是为每条记录创建一个字典：
+    - 解析器按行追加数据，或直接传入整列
+    - 数据库层通过 rows() 将各列 zip 成元组交给 executemany
+    - 按记录迭代时产出字典，兼容原有 List[Dict] 的调用方式
+    """
+
+    __slots__ = ('fields', 'columns')
+
+    def __init__(self, fields: Sequence[str]):
+        """
+        初始化空缓冲区
+
+        Args:
+            fields: 字段名列表（决定列顺序）
+        """
+        self.fields = tuple(fields)
+        self.columns: Dict[str, List[Any]] = {field: [] for field in self.fields}
+
+    @classmethod
+    def from_columns(cls, columns: Dict[str, Sequence[Any]]) -> 'ColumnBuffer':
+        """
+        由现成的列数据构建缓冲区
+
+        Args:
+            columns: 字段名 -> 列数据（各列长度必须一致）
+
+        Returns:
+            ColumnBuffer 对象
+        """
+        lengths = {len(column) for column in columns.values()}
+        if len(lengths) > 1:
+            raise ValueError(f"列长度不一致: {sorted(lengths)}")
+
+        buffer = cls(columns.keys())
+        buffer.columns = dict(columns)
+        return buffer
+
+    def append(self, *values: Any):
+        """
+        追加一行数据
+
+        Args:
+            values: 按字段顺序排列的各列值
+        """
+        if len(values) != len(self.fields):
+            raise ValueError(f"字段数量不匹配: 需要 {len(self.fields)} 个，实际 {len(values)} 个")
+
+        for field, value in zip(self.fields, values):
+            self.columns[field].append(value)
+
+    def extend(self, other: 'ColumnBuffer'):
+        """
+        按列追加另一个缓冲区的全部数据（不逐行转换）
+
+        Args:
+            other: 字段相同的缓冲区
+        """
+        if other.fields != self.fields:
+            raise ValueError(f"字段不一致: {other.fields} != {self.fields}")
+
+        for field in self.fields:
+            column = self.columns[field]
+            if not isinstance(column, list):  # from_columns 传入的数组等先转为列表
+                column = self.columns[field] = list(self._column_values(field))
+            column.extend(other._column_values(field))
+
+    def rows(self, fields: Optional[Sequence[str]] = None) -> Iterator[Tuple[Any, ...]]:
+        """
+        按行产出元组（适合直接传给 executemany）
+
+        Args:
+            fields: 输出字段及顺序，默认使用缓冲区字段顺序
+
+        Returns:
+            行元组迭代器
+        """
+        fields = self.fields if fields is None else fields
+        return zip(*(self._column_values(field) for field in fields))
+
+    def _column_values(self, field: str) -> Sequence[Any]:
+        """
+        获取列数据；numpy 数组转换为 Python 原生值，便于 sqlite3 绑定
+        """
+        column = self.columns[field]
+        return column.tolist() if hasattr(column, 'tolist') else column
+
+    def __len__(self) -> int:
+        if not self.fields:
+            return 0
+        return len(self.columns[self.fields[0]])
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        for row in self.rows():
+            yield dict(zip(self.fields, row))
+
+    def __getitem__(self, index: Union[int, slice]):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        return {field: self.columns[field][index] for field in self.fields}
+
+    def __repr__(self) -> str:
+        return f"ColumnBuffer(fields={self.fields}, rows={len(self)})"
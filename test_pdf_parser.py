@@ -15,8 +15,7 @@ from pathlib import Path
 sys.path.insert(0, str(Path(__file__).parent / "src"))
 
 from src.logger import setup_logger
-from src.parsers import DeliveryNoticeParser
-import pdfplumber
+from src.parsers import DeliveryNoticeParser, detect_report_type
 
 
 def test_pdf_extraction(pdf_path: Path):
@@ -32,49 +31,28 @@ def test_pdf_extraction(pdf_path: Path):
     logger.info(f"测试 PDF: {pdf_path.name}")
     logger.info(f"="*80)
 
-    # 1. 查看原始文本
-    logger.info("\n--- 步骤1: 提取原始文本 ---")
-    with pdfplumber.open(pdf_path) as pdf:
-        for page_num, page in enumerate(pdf.pages[:3], 1):  # 只查看前3页
-            logger.info(f"\n第 {page_num} 页内容：")
-            text = page.extract_text()
-            if text:
-                # 只显示前1000个字符
-                logger.info(text[:1000])
-                logger.info("...")
-            else:
-                logger.warning("页面没有文本内容")
-
-    # 2. 测试解析器
-    logger.info("\n--- 步骤2: 使用解析器 ---")
+    # 使用解析器（页面文本只提取一次，直接查看解析结果）
     parser = DeliveryNoticeParser(logger)
 
-    # 确定报告类型
-    filename = pdf_path.name.lower()
-    if 'daily' in filename:
-        report_type = 'Daily'
-    elif 'monthly' in filename or 'mtd' in filename:
-        report_type = 'Monthly'
-    elif 'ytd' in filename or 'year' in filename:
-        report_type = 'YTD'
-    else:
-        report_type = 'Daily'
+    # 确定报告类型（与 ETL 使用同一规则）
+    report_type = detect_report_type(pdf_path.name)
 
     logger.info(f"报告类型: {report_type}")
 
-    # 解析文件
-    records = parser.parse_file(pdf_path, report_type)
+    # 逐页解析文件，只展示前5条记录
+    count = 0
+    for count, record in enumerate(parser.iter_records(pdf_path, report_type), 1):
+        if count == 1:
+            logger.info("\n前5条记录：")
+        if count <= 5:
+            logger.info(f"{count}. {record}")
 
-    logger.info(f"\n解析结果: 共提取 {len(records)} 条记录")
+    logger.info(f"\n解析结果: 共提取 {count} 条记录")
 
-    if records:
-        logger.info("\n前5条记录：")
-        for i, record in enumerate(records[:5], 1):
-            logger.info(f"{i}. {record}")
-    else:
+    if not count:
         logger.warning("未提取到任何记录")
 
-    logger.info(f"\n{"="*80}")
+    logger.info(f"\n{'='*80}")
 
 
 def main():